@@ -0,0 +1,119 @@
+import gzip
+import lzma
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+# ARCHIVE SERVICE - .Zip Branch output is cached by the branch's tree hash, so archiving
+# a tree that hasn't changed is a copy of the cached file. zip comes straight
+# from `git archive`; tar.gz/tar.xz compress git's tar stream in-process at the chosen level.
+ARCHIVE_FORMATS = {"zip": ".zip", "tar.gz": ".tar.gz", "tar.xz": ".tar.xz"}
+DEFAULT_LEVELS = {"zip": 6, "tar.gz": 6, "tar.xz": 6}
+ARCHIVE_CACHE_LIMIT = 20  # newest cached archives kept
+CHUNK = 256 * 1024
+
+def archive_cache_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "codecup", "archives")
+
+class ArchiveError(Exception):
+    pass
+
+def _git_output(args, cwd):
+    result = subprocess.run(["git", *args], cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise ArchiveError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+def tree_id(full_path, branch):
+    return _git_output(["rev-parse", "--verify", f"{branch}^{{tree}}"], full_path).strip()
+
+def tree_size(full_path, tree):
+    """Uncompressed bytes in the tree, for progress. `git ls-tree -l` reads sizes without inflating blobs."""
+    total = 0
+    for line in _git_output(["ls-tree", "-r", "-l", tree], full_path).splitlines():
+        size = line.split(None, 4)[3]
+        total += int(size) if size.isdigit() else 0
+    return total
+
+def cache_path(tree, fmt, level, cache_dir=""):
+    return os.path.join(cache_dir or archive_cache_dir(), f"{tree}-{level}{ARCHIVE_FORMATS[fmt]}")
+
+def _write_archive(full_path, tree, fmt, level, target, on_progress=None):
+    if fmt == "zip":
+        args, out = ["archive", "--format=zip", f"-{level}", tree], open(target, "wb")
+    else:
+        args = ["archive", "--format=tar", tree]
+        out = gzip.open(target, "wb", compresslevel=level) if fmt == "tar.gz" else lzma.open(target, "wb", preset=level)
+    total = tree_size(full_path, tree) if on_progress else 0
+    # stderr goes to a file: a pipe left unread while stdout drains can fill up and stall both sides
+    errors = tempfile.TemporaryFile()
+    process = subprocess.Popen(["git", *args], cwd=full_path, stdout=subprocess.PIPE, stderr=errors)
+    done, last_percent = 0, -1
+    with out, errors:
+        while True:
+            chunk = process.stdout.read(CHUNK)
+            if not chunk:
+                break
+            out.write(chunk)
+            done += len(chunk)
+            # zip output is compressed, tar output carries headers: both only approximate the tree size
+            percent = min(99, done * 100 // total) if total else 0
+            if on_progress and percent != last_percent:
+                last_percent = percent
+                on_progress(percent)
+        if process.wait() != 0:
+            errors.seek(0)
+            raise ArchiveError(errors.read().decode("utf-8", "replace").strip() or "git archive failed")
+
+def _place(source, destination):
+    tmp = f"{destination}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    # A copy, never a hardlink: the user's file would share an inode with the cache, so editing
+    # or appending to it would silently corrupt the cached archive for the next run
+    shutil.copyfile(source, tmp)
+    os.replace(tmp, destination)
+
+def prune_cache(cache_dir="", keep=ARCHIVE_CACHE_LIMIT):
+    cache_dir = cache_dir or archive_cache_dir()
+    try:
+        entries = sorted(os.scandir(cache_dir), key=lambda entry: entry.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for entry in entries[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+def archive_branch(full_path, branch, destination, fmt="zip", level=None, on_progress=None, cache_dir=""):
+    """
+    Writes branch as fmt to destination (extension added). Returns {path, tree, cached, seconds, size}.
+    """
+    started = time.monotonic()
+    level = DEFAULT_LEVELS[fmt] if level is None else level
+    destination += ARCHIVE_FORMATS[fmt]
+    tree = tree_id(full_path, branch)
+    cached_file = cache_path(tree, fmt, level, cache_dir)
+    cached = os.path.isfile(cached_file)
+    if not cached:
+        os.makedirs(os.path.dirname(cached_file), exist_ok=True)
+        fd, partial = tempfile.mkstemp(dir=os.path.dirname(cached_file), suffix=".partial")
+        os.close(fd)
+        try:
+            _write_archive(full_path, tree, fmt, level, partial, on_progress)
+            os.replace(partial, cached_file)
+        except BaseException:
+            os.remove(partial)
+            raise
+        prune_cache(cache_dir)
+    else:
+        os.utime(cached_file)  # keep recently used archives out of the prune
+    _place(cached_file, destination)
+    if on_progress:
+        on_progress(100)
+    return {"path": destination, "tree": tree, "cached": cached, "seconds": time.monotonic() - started,
+            "size": os.path.getsize(destination)}
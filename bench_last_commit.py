@@ -0,0 +1,83 @@
+"""
+Branch list + last commit for the status panel: .git reader (refs.py/objects.py) vs one `git for-each-ref` per repo.
+
+Builds --repos throwaway repos with a few branches and commits (every other one gc'd, so both loose
+and packed objects are read), then times each path over all of them and checks they print the same line.
+
+    python bench_last_commit.py [--repos 300] [--runs 3]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from git_status import REF_FORMAT, RepoStatus, parse_refs
+from objects import last_commit_line
+from refs import read_refs
+
+GIT_ENV = {**os.environ, "GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@example.com",
+           "GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@example.com"}
+
+def git(cwd, *args, env=None):
+    subprocess.run(["git", *args], cwd=cwd, env={**GIT_ENV, **(env or {})}, check=True, stdout=subprocess.DEVNULL)
+
+def build_repos(base, count):
+    # Authored a year before they were committed, as after a rebase, so dating by the wrong
+    # timestamp shows up as a mismatch. Weeks old, so the two passes agree on "N weeks ago".
+    started = int(time.time()) - 30 * 86400
+    paths = []
+    for i in range(count):
+        path = os.path.join(base, f"repo{i:04d}")
+        git(base, "init", "-q", "-b", "main", path)
+        for branch in ("main", "feature", "fix"):
+            if branch != "main":
+                git(path, "checkout", "-q", "-b", branch)
+            for n in range(3):
+                with open(os.path.join(path, f"{branch}.txt"), "a") as f:
+                    f.write(f"{n}\n")
+                git(path, "add", "-A")
+                when = started + n * 3600
+                git(path, "commit", "-q", "-m", f"{branch} change {n} in repo {i}",
+                    env={"GIT_AUTHOR_DATE": f"{when - 365 * 86400} +0000", "GIT_COMMITTER_DATE": f"{when} +0000"})
+        git(path, "checkout", "-q", "main")
+        if i % 2:
+            git(path, "gc", "-q")
+        paths.append(path)
+    return paths
+
+def from_disk(path):
+    refs = read_refs(path)
+    return last_commit_line(path, refs.head_oid), refs.local
+
+def from_git(path):
+    out = subprocess.run(["git", "for-each-ref", f"--format={REF_FORMAT}", "refs/heads"], cwd=path,
+                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+    status = parse_refs(RepoStatus(path=path, branch="main"), out)
+    return status.last_commit, [line[2:] for line in status.branches]
+
+def timed(read, paths, runs):
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        results = [read(path) for path in paths]
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repos", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="codecup-bench-") as base:
+        paths = build_repos(base, args.repos)
+        disk_seconds, disk = timed(from_disk, paths, args.runs)
+        git_seconds, via_git = timed(from_git, paths, args.runs)
+        mismatched = sum(1 for a, b in zip(disk, via_git) if a[0] != b[0] or sorted(a[1]) != sorted(b[1]))
+        print(f"{args.repos} repos, median of {args.runs} runs")
+        print(f"  .git reader      {disk_seconds:8.3f}s  ({disk_seconds / args.repos * 1000:.2f} ms/repo)")
+        print(f"  git for-each-ref {git_seconds:8.3f}s  ({git_seconds / args.repos * 1000:.2f} ms/repo)")
+        print(f"  {mismatched} repos where the two disagree")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Fetch Branch restore: incremental (worktree.restore_incremental) vs wipe-and-checkout (worktree.restore_by_wipe).
+
+Builds a throwaway repo with --files files on main and a branch that changes --changed of them, then
+times each mode restoring that branch into a main checkout and counts the files it rewrote.
+
+    python bench_restore.py [--files 10000] [--changed 1] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from worktree import restore_by_wipe, restore_incremental
+
+GIT_ENV = {**os.environ, "GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@example.com",
+           "GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@example.com"}
+
+def git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, env=GIT_ENV, check=True, stdout=subprocess.DEVNULL)
+
+def build_repo(path, files, changed):
+    git(path, "init", "-q", "-b", "main")
+    for i in range(files):
+        directory = os.path.join(path, f"d{i // 100:03d}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"f{i:05d}.txt"), "w") as f:
+            f.write(f"file {i}\n" * 20)
+    git(path, "add", "-A")
+    git(path, "commit", "-q", "-m", "base")
+    git(path, "checkout", "-q", "-b", "other")
+    for i in range(changed):
+        with open(os.path.join(path, f"d{i // 100:03d}", f"f{i:05d}.txt"), "a") as f:
+            f.write("changed\n")
+    git(path, "commit", "-q", "-am", "change")
+    git(path, "checkout", "-q", "main")
+
+def snapshot(path):
+    stats = {}
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = [name for name in dirnames if name != ".git"]
+        for name in filenames:
+            st = os.stat(os.path.join(dirpath, name))
+            stats[os.path.join(dirpath, name)] = (st.st_ino, st.st_mtime_ns)
+    return stats
+
+def run(path, restore, runs):
+    times, rewritten = [], 0
+    for _ in range(runs):
+        git(path, "checkout", "-q", "-f", "main")
+        before = snapshot(path)
+        time.sleep(0.01)  # keep rewrites visible at coarse mtime resolution
+        started = time.perf_counter()
+        restore(path, "other")
+        times.append(time.perf_counter() - started)
+        after = snapshot(path)
+        rewritten = sum(1 for name, stat in after.items() if before.get(name) != stat)
+    return statistics.median(times), rewritten
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--changed", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="codecup-bench-") as path:
+        build_repo(path, args.files, args.changed)
+        print(f"{args.files} files, {args.changed} changed on the branch, median of {args.runs} runs")
+        for label, restore in (("incremental", restore_incremental), ("wipe", restore_by_wipe)):
+            seconds, rewritten = run(path, restore, args.runs)
+            print(f"  {label:<12} {seconds:8.3f}s  {rewritten:6d} files rewritten")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Status panel render time as the file list grows: update_editor vs the per-line insert it replaced.
+
+Renders a git-status-shaped listing of --sizes files into a real tk.Text (needs a display) and reports
+the median time per render, including the layout pass Tk does before the next frame.
+
+    python bench_update_editor.py [--sizes 100,1000,10000,20000,100000] [--runs 5]
+"""
+import argparse
+import statistics
+import time
+import tkinter as tk
+from logic import EDITOR_TAGS, update_editor
+
+def status_listing(files):
+    return [("Git repo at: /bench/repo", "bold_large"), ("", "normal"), ("Status: On branch main", "bold_medium"),
+            ("  Untracked files:", "normal"), [(f"    build/out/file{i:06d}.o", "normal") for i in range(files)],
+            ("", "normal"), ("Branch: main", "bold_larger")]
+
+def per_line_insert(text_editor, lines):
+    # The renderer before batching: tags configured on every call, one insert per line
+    text_editor.delete(1.0, 'end')
+    for tag, font in EDITOR_TAGS.items():
+        text_editor.tag_configure(tag, font=font)
+    for line in lines:
+        for text, tag in (line if isinstance(line, list) else [line]):
+            text_editor.insert('end', f"{text}\n", tag)
+
+def timed(root, render, text_editor, lines, runs):
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        render(text_editor, lines)
+        root.update_idletasks()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000,20000,100000")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    root = tk.Tk()
+    root.withdraw()
+    text_editor = tk.Text(root, wrap=tk.NONE, font=("Courier", 10))
+    text_editor.pack()
+    print(f"{'files':>8}  {'update_editor':>14}  {'per-line insert':>16}  (median of {args.runs})")
+    for size in (int(size) for size in args.sizes.split(",")):
+        lines = status_listing(size)
+        batched = timed(root, update_editor, text_editor, lines, args.runs)
+        per_line = timed(root, per_line_insert, text_editor, lines, args.runs)
+        print(f"{size:>8}  {batched * 1000:>12.1f}ms  {per_line * 1000:>14.1f}ms")
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
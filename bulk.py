@@ -0,0 +1,181 @@
+import os
+import subprocess
+import time
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import worker
+from staging import add_command, changed_paths
+from logic import CenteredDialog, center_window_on_parent, centered_askstring, invalidate_status, refresh_badges, require_gh_login, update_single_repo_status
+
+# BULK OPERATIONS - one action over many selected repos, BULK_WORKERS repos at a time.
+# Each repo gets its own status row; the window ends with a success/failure summary.
+BULK_WORKERS = 4
+MAX_BULK_WORKERS = 16
+BULK_ENV = dict(os.environ, GIT_TERMINAL_PROMPT="0")  # never hang a worker on a credential prompt
+
+def _run(argv, cwd):
+    try:
+        result = subprocess.run(argv, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, env=BULK_ENV)
+    except OSError as e:
+        return 1, str(e)
+    return result.returncode, result.stdout.strip()
+
+def _last_line(output, fallback):
+    lines = [line for line in output.splitlines() if line.strip()]
+    return lines[-1] if lines else fallback
+
+def _steps(full_path, *steps):
+    output = ""
+    for argv in steps:
+        code, output = _run(argv, full_path)
+        if code != 0:
+            return False, _last_line(output, f"{' '.join(argv[:2])} failed")
+    return True, _last_line(output, "done")
+
+def op_save(full_path, message):
+    paths, staged, _ = changed_paths(full_path)
+    if paths is None:
+        return False, "git status failed"
+    if paths:
+        argv, pathspecs = add_command(paths)
+        result = subprocess.run(argv, cwd=full_path, input=pathspecs, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=BULK_ENV)
+        if result.returncode != 0:
+            return False, _last_line(result.stdout.decode("utf-8", "replace"), "git add failed")
+    if paths or staged:
+        code, output = _run(["git", "commit", "-m", message or "updated"], full_path)
+        if code != 0:
+            return False, _last_line(output, "git commit failed")
+    return _steps(full_path, ["git", "push", "-u", "origin", "HEAD"])
+
+def op_fetch(full_path, _):
+    return _steps(full_path, ["git", "fetch", "--all", "--prune"])
+
+def op_swap(full_path, branch):
+    return _steps(full_path, ["git", "checkout", branch])
+
+def op_public(full_path, _):
+    return _steps(full_path, ["gh", "repo", "edit", "--visibility", "public"])
+
+def op_private(full_path, _):
+    return _steps(full_path, ["gh", "repo", "edit", "--visibility", "private"])
+
+BULK_OPERATIONS = {"Save Branch": op_save, "Fetch": op_fetch, "Swap Branch": op_swap,
+                   "Go Public": op_public, "Go Private": op_private}
+VISIBILITY_RESULT = {"Go Public": False, "Go Private": True}
+NEEDS_GH_LOGIN = {"Save Branch", "Go Public", "Go Private"}
+
+class BulkConfirmDialog(CenteredDialog):
+    def __init__(self, parent, title, message):
+        self.message = message
+        self.result = None
+        super().__init__(parent, title)
+
+    def body(self, master):
+        tk.Label(master, text=self.message, justify="left", wraplength=360).pack(padx=10, pady=(10, 5))
+        row = tk.Frame(master)
+        row.pack(padx=10, pady=(0, 10))
+        tk.Label(row, text="Parallel workers:").pack(side=tk.LEFT)
+        self.workers = tk.Spinbox(row, from_=1, to=MAX_BULK_WORKERS, width=4)
+        self.workers.delete(0, tk.END)
+        self.workers.insert(0, str(BULK_WORKERS))
+        self.workers.pack(side=tk.LEFT, padx=5)
+        return self.workers
+
+    def validate(self):
+        try:
+            return 1 <= int(self.workers.get()) <= MAX_BULK_WORKERS
+        except ValueError:
+            return False
+
+    def apply(self):
+        self.result = int(self.workers.get())
+
+class BulkWindow(tk.Toplevel):
+    def __init__(self, parent, title, names):
+        super().__init__(parent)
+        self.title(title)
+        self.total, self.done, self.failed = len(names), 0, 0
+        self.progress = tk.Label(self, text=f"0 / {self.total} done", anchor="w")
+        self.progress.pack(fill=tk.X, padx=5, pady=(5, 0))
+        self.rows = ttk.Treeview(self, columns=("status", "detail"), height=min(max(len(names), 3), 15))
+        self.rows.heading("#0", text="Repo")
+        self.rows.heading("status", text="Status")
+        self.rows.heading("detail", text="Detail")
+        self.rows.column("status", width=90, stretch=False)
+        self.rows.column("detail", width=320)
+        for name in names:
+            self.rows.insert("", "end", iid=name, text=name, values=("queued", ""))
+        self.rows.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        tk.Button(self, text="Close", width=10, command=self.destroy).pack(pady=(0, 5))
+        center_window_on_parent(self, parent)
+
+    def set_row(self, name, status, detail=""):
+        if self.winfo_exists():
+            self.rows.item(name, values=(status, detail))
+
+    def finish_row(self, name, ok, detail):
+        self.done += 1
+        self.failed += not ok
+        self.set_row(name, "✔ ok" if ok else "✖ failed", detail)
+        if self.winfo_exists():
+            self.progress.config(text=f"{self.done} / {self.total} done")
+
+    def summarize(self, elapsed):
+        if self.winfo_exists():
+            self.progress.config(text=f"{self.total - self.failed} succeeded, {self.failed} failed in {elapsed:.1f}s",
+                                 fg="#008000" if not self.failed else "#FF0000")
+
+def run_bulk(globals_dict, operation, repos, arg=None, workers=BULK_WORKERS):
+    """
+    Runs BULK_OPERATIONS[operation] over repos {name: full_path} without blocking the main loop.
+    """
+    func = BULK_OPERATIONS[operation]
+    window = BulkWindow(globals_dict['root'], f"{operation} - {len(repos)} repos", list(repos))
+    started = time.monotonic()
+
+    def one(name, full_path):
+        worker.call_soon(window.set_row, name, "running")
+        return func(full_path, arg)
+
+    def run_all():
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk") as pool:
+            futures = {pool.submit(one, name, full_path): name for name, full_path in repos.items()}
+            for future in as_completed(futures):
+                try:
+                    ok, detail = future.result()
+                except Exception as e:
+                    ok, detail = False, str(e)
+                worker.call_soon(on_repo_done, futures[future], ok, detail)
+
+    def on_repo_done(name, ok, detail):
+        window.finish_row(name, ok, detail)
+        if ok and operation in VISIBILITY_RESULT:
+            update_single_repo_status(repos[name], is_private=VISIBILITY_RESULT[operation])
+        invalidate_status(repos[name])
+
+    def on_all_done(_):
+        window.summarize(time.monotonic() - started)
+        refresh_badges(globals_dict['treeview'], list(repos.values()))
+
+    worker.submit(run_all, callback=on_all_done, long=True)
+    return window
+
+def bulk_action(globals_dict, operation, names):
+    """
+    Asks for whatever the operation needs (commit message, branch), confirms, then runs it over names.
+    """
+    if operation in NEEDS_GH_LOGIN and not require_gh_login(): return
+    root = globals_dict['root']
+    arg = None
+    if operation == "Save Branch":
+        arg = centered_askstring(root, "Save Branch", f"Commit message for {len(names)} repos:", initialvalue="updated")
+        if arg is None: return
+    elif operation == "Swap Branch":
+        arg = centered_askstring(root, "Swap Branch", f"Branch to check out in {len(names)} repos:")
+        if not arg: return
+    listing = "\n".join(names[:10]) + (f"\n... and {len(names) - 10} more" if len(names) > 10 else "")
+    workers = BulkConfirmDialog(root, operation, f"{operation} in {len(names)} repos?\n\n{listing}").result
+    if workers is None: return
+    base_path = globals_dict['entry'].get().strip()
+    return run_bulk(globals_dict, operation, {name: os.path.join(base_path, name) for name in names}, arg, workers)
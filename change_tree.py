@@ -0,0 +1,208 @@
+import subprocess
+import worker
+from git_status import STATUS_WORDS, RepoStatus, parse_porcelain_v2
+
+# CHANGE TREE - the selected repo's staged/unstaged/conflicted/untracked files as a tree.
+# Directory rows carry their file counts and only get children the first time they're
+# opened. Status runs with --untracked-files=normal, so an untracked directory arrives as
+# one "dir/" entry; opening it lists that directory alone with --untracked-files=all.
+GROUPS = (("staged", "Staged"), ("unstaged", "Unstaged"), ("conflicts", "Conflicts"), ("untracked", "Untracked"))
+PLACEHOLDER = "::placeholder"
+MORE_ROW = "::more"
+PAGE_SIZE = 200  # rows materialized per directory before a "▼ N more" row
+_changes = {"tree": None, "path": "", "groups": {}, "pages": {}, "opened": set(), "loading": set()}
+
+class ChangeGroup:
+    """
+    One group's files indexed by directory: children[dir] is [(name, path, kind)] with kind
+    "dir", "file" or "pending" (untracked directory not listed yet); counts[dir] is (files, partial).
+    """
+    def __init__(self, files, pending=()):
+        self.files = dict(files)      # path -> status code
+        self.pending = set(pending)   # "dir/" paths still collapsed into one entry
+        self.index()
+
+    def index(self):
+        children, counts, dirs = {"": {}}, {"": [0, False]}, set()
+        for path, kind in [(path, "file") for path in self.files] + [(path, "pending") for path in self.pending]:
+            parts = path.rstrip("/").split("/")
+            parent = ""
+            for part in parts[:-1]:
+                node = f"{parent}{part}/"
+                if node not in dirs:
+                    dirs.add(node)
+                    children[parent][part] = (node, "dir")
+                    children[node], counts[node] = {}, [0, False]
+                counts[parent][0] += kind == "file"
+                counts[parent][1] |= kind == "pending"
+                parent = node
+            counts[parent][0] += kind == "file"
+            counts[parent][1] |= kind == "pending"
+            children[parent][parts[-1]] = (path, kind)
+        # Directories first, then files, each by name
+        self.children = {parent: sorted(((name, path, kind) for name, (path, kind) in entries.items()),
+                                        key=lambda entry: (entry[2] == "file", entry[0].lower()))
+                         for parent, entries in children.items()}
+        self.counts = {node: tuple(count) for node, count in counts.items()}
+
+    def expand(self, directory, paths):
+        """Replaces the pending entry for directory with the untracked files found in it."""
+        self.pending.discard(directory)
+        for path in paths:
+            if path.endswith("/"):
+                self.pending.add(path)  # nested repo or empty-looking dir git still reports whole
+            else:
+                self.files[path] = "?"
+        self.index()
+
+def _new_path(path):
+    # Renames arrive as "old -> new"; the tree files them under the new name
+    return path.rsplit(" -> ", 1)[-1]
+
+def change_groups(status):
+    groups = {
+        "staged": ChangeGroup((_new_path(path), code) for code, path in status.staged),
+        "unstaged": ChangeGroup((_new_path(path), code) for code, path in status.unstaged),
+        "conflicts": ChangeGroup((path, "U") for path in status.conflicts),
+        "untracked": ChangeGroup(((path, "?") for path in status.untracked if not path.endswith("/")),
+                                 (path for path in status.untracked if path.endswith("/"))),
+    }
+    return {name: group for name, group in groups.items() if group.files or group.pending}
+
+def list_untracked(full_path, directory):
+    """Every untracked file under directory ("dir/"), from a status limited to that pathspec."""
+    try:
+        result = subprocess.run(["git", "--no-optional-locks", "--literal-pathspecs", "status", "--porcelain=v2", "-z",
+                                 "--untracked-files=all", "--", directory],
+                                cwd=full_path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return []
+    if result.returncode != 0:
+        return []
+    return parse_porcelain_v2(RepoStatus(path=full_path), result.stdout).untracked
+
+def _iid(group, path):
+    return f"{group}:{path}"
+
+def _count_label(count):
+    files, partial = count
+    return f"{files}+ files" if partial else f"{files} file{'s' if files != 1 else ''}"
+
+def _rows(group_name, parent):
+    group = _changes["groups"][group_name]
+    entries = group.children.get(parent, [])
+    limit = _changes["pages"].get(_iid(group_name, parent), PAGE_SIZE)
+    rows = []
+    for name, path, kind in entries[:limit]:
+        if kind == "file":
+            code = group.files[path]
+            rows.append((_iid(group_name, path), name, (STATUS_WORDS.get(code, "untracked" if code == "?" else code),), False))
+        elif kind == "dir":
+            rows.append((_iid(group_name, path), f"📁 {name}/", (_count_label(group.counts[path]),), True))
+        else:
+            rows.append((_iid(group_name, path), f"📁 {name}/", ("…",), True))
+    if len(entries) > limit:
+        rows.append((_iid(group_name, parent) + MORE_ROW, f"▼ {len(entries) - limit} more...", ("",), False))
+    return rows
+
+def _fill(tree, iid):
+    # Replaces iid's children with its current page of rows; directories get a placeholder until opened
+    group_name, _, parent = iid.partition(":")
+    tree.delete(*tree.get_children(iid))
+    for row_iid, text, values, is_dir in _rows(group_name, parent):
+        tree.insert(iid, "end", iid=row_iid, text=text, values=values)
+        if is_dir:
+            tree.insert(row_iid, "end", iid=row_iid + PLACEHOLDER, text="...")
+            if row_iid in _changes["opened"]:
+                open_node(tree, row_iid)
+
+def _refresh_counts(tree, group_name):
+    group = _changes["groups"][group_name]
+    for path, count in group.counts.items():
+        iid = _iid(group_name, path)
+        if path and tree.exists(iid):
+            tree.set(iid, "info", _count_label(count))
+    tree.set(_iid(group_name, ""), "info", _count_label(group.counts[""]))
+
+def show_changes(status):
+    """
+    Rebuilds the tree for status, keeping directories the user opened in this repo open.
+    """
+    tree = _changes["tree"]
+    if tree is None:
+        return
+    if _changes["path"] != status.path:
+        _changes.update(path=status.path, pages={}, opened=set())
+    _changes.update(groups=change_groups(status), loading=set())
+    tree.delete(*tree.get_children())
+    for group_name, title in GROUPS:
+        group = _changes["groups"].get(group_name)
+        if group is None:
+            continue
+        root = _iid(group_name, "")
+        tree.insert("", "end", iid=root, text=title, values=(_count_label(group.counts[""]),))
+        tree.insert(root, "end", iid=root + PLACEHOLDER, text="...")
+        if root in _changes["opened"] or len(_changes["groups"]) == 1:
+            open_node(tree, root)
+    if not _changes["groups"]:
+        tree.insert("", "end", iid="::clean", text="Nothing to commit", values=("",))
+
+def clear_changes():
+    tree = _changes["tree"]
+    _changes.update(path="", groups={}, pages={}, opened=set(), loading=set())
+    if tree is not None:
+        tree.delete(*tree.get_children())
+
+def open_node(tree, iid):
+    tree.item(iid, open=True)
+    expand_node(tree, iid)
+
+def expand_node(tree, iid):
+    # <<TreeviewOpen>>: directories fill from the index; untracked "dir/" entries ask git first
+    if not iid:
+        return
+    _changes["opened"].add(iid)
+    if not tree.exists(iid + PLACEHOLDER):
+        return
+    group_name, _, path = iid.partition(":")
+    group = _changes["groups"].get(group_name)
+    if group is None:
+        return
+    if path not in group.pending:
+        _fill(tree, iid)
+        return
+    if iid in _changes["loading"]:
+        return
+    _changes["loading"].add(iid)
+    tree.item(iid + PLACEHOLDER, text="loading...")
+    full_path = _changes["path"]
+
+    def on_listed(paths):
+        _changes["loading"].discard(iid)
+        if _changes["path"] != full_path or _changes["groups"].get(group_name) is not group or not tree.exists(iid):
+            return  # another repo was selected, or the status was re-read, while git ran
+        group.expand(path, paths)
+        _fill(tree, iid)
+        _refresh_counts(tree, group_name)
+        if path not in group.counts:
+            tree.set(iid, "info", _count_label((0, False)))
+
+    worker.submit(list_untracked, full_path, path, key=f"untracked:{full_path}:{path}", callback=on_listed,
+                  on_error=lambda e: _changes["loading"].discard(iid))
+
+def collapse_node(tree, iid):
+    _changes["opened"].discard(iid)
+
+def on_change_select(tree):
+    selection = tree.selection()
+    if selection and selection[0].endswith(MORE_ROW):
+        parent = selection[0][:-len(MORE_ROW)]
+        _changes["pages"][parent] = _changes["pages"].get(parent, PAGE_SIZE) + PAGE_SIZE
+        tree.selection_remove(selection[0])
+        _fill(tree, parent)
+
+def attach(tree):
+    _changes["tree"] = tree
+    tree.bind("<<TreeviewOpen>>", lambda e: expand_node(tree, tree.focus()))
+    tree.bind("<<TreeviewClose>>", lambda e: collapse_node(tree, tree.focus()))
+    tree.bind("<<TreeviewSelect>>", lambda e: on_change_select(tree))
@@ -0,0 +1,153 @@
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+# CLONE ENGINE - many URLs at once, CLONE_WORKERS at a time, with optional partial/shallow
+# modes and a local mirror cache. A mirrored URL is cloned with --reference/--dissociate,
+# so only objects the mirror lacks come over the network and the clone owns its objects.
+# Plain git against any URL, so file:// bare remotes stand in for GitHub.
+CLONE_WORKERS = 4
+CLONE_MODES = ("full", "blobless", "shallow")
+DEFAULT_DEPTH = 1
+CLONE_ENV = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+
+def mirror_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "codecup", "mirrors")
+
+@dataclass
+class CloneOptions:
+    mode: str = "full"  # one of CLONE_MODES
+    depth: int = DEFAULT_DEPTH
+    single_branch: bool = False
+    use_mirror: bool = False
+    cache_dir: str = ""  # mirror cache; mirror_dir() when empty
+
+@dataclass
+class CloneResult:
+    url: str
+    path: str
+    ok: bool
+    message: str = ""
+    seconds: float = 0.0
+    used_mirror: bool = False
+
+_mirror_locks = {}
+_mirror_locks_guard = threading.Lock()
+
+def _git(args, cwd=None):
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, env=CLONE_ENV)
+    except OSError as e:
+        return 1, str(e)
+    return result.returncode, result.stdout.strip()
+
+def _last_line(output, fallback):
+    lines = [line for line in output.splitlines() if line.strip()]
+    errors = [line for line in lines if line.startswith(("fatal:", "error:"))]
+    return (errors or lines or [fallback])[0 if errors else -1]
+
+def repo_name_from_url(url):
+    name = re.split(r"[/:]", url.rstrip("/"))[-1]
+    return name[:-4] if name.endswith(".git") else name
+
+def parse_urls(text):
+    """One URL per line (or whitespace separated), duplicates dropped, order kept."""
+    return list(dict.fromkeys(text.split()))
+
+def mirror_path(url, cache_dir=""):
+    digest = hashlib.sha1(url.rstrip("/").encode()).hexdigest()[:12]
+    return os.path.join(cache_dir or mirror_dir(), f"{repo_name_from_url(url)}-{digest}.git")
+
+def _mirror_lock(path):
+    with _mirror_locks_guard:
+        return _mirror_locks.setdefault(path, threading.Lock())
+
+def update_mirror(url, cache_dir=""):
+    """
+    Creates or refreshes the bare mirror for url. Returns (mirror_path or None, message).
+    """
+    path = mirror_path(url, cache_dir)
+    with _mirror_lock(path):
+        if os.path.isdir(path):
+            code, output = _git(["--git-dir", path, "remote", "update", "--prune"])
+            # A stale mirror still saves most of the transfer
+            return path, "mirror updated" if code == 0 else f"mirror stale: {_last_line(output, 'update failed')}"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.partial"
+        shutil.rmtree(partial, ignore_errors=True)
+        code, output = _git(["clone", "--mirror", "--quiet", url, partial])
+        if code != 0:
+            shutil.rmtree(partial, ignore_errors=True)
+            return None, f"no mirror: {_last_line(output, 'mirror clone failed')}"
+        os.replace(partial, path)
+        return path, "mirror created"
+
+def clone_args(url, dest, options, reference=None):
+    args = ["clone", "--quiet"]
+    if options.mode == "blobless":
+        args.append("--filter=blob:none")
+    elif options.mode == "shallow":
+        args += ["--depth", str(max(int(options.depth), 1))]
+    if options.single_branch:
+        args.append("--single-branch")
+    if reference:
+        args += ["--reference", reference, "--dissociate"]
+    return args + ["--", url, dest]
+
+def clone_one(url, base_path, options=None):
+    options = options or CloneOptions()
+    started = time.monotonic()
+    dest = os.path.join(base_path, repo_name_from_url(url))
+    if os.path.exists(dest):
+        return CloneResult(url, dest, False, f"'{os.path.basename(dest)}' already exists")
+    reference, notes = None, []
+    if options.use_mirror:
+        reference, note = update_mirror(url, options.cache_dir)
+        notes.append(note)
+    code, output = _git(clone_args(url, dest, options, reference), cwd=base_path)
+    if code != 0:
+        message = _last_line(output, "git clone failed")
+    else:
+        message = f"cloned ({options.mode}{', single branch' if options.single_branch else ''})"
+    return CloneResult(url, dest, code == 0, "; ".join([message] + notes), time.monotonic() - started, reference is not None)
+
+def clone_many(urls, base_path, options=None, on_result=None, max_workers=CLONE_WORKERS):
+    """
+    Clones urls into base_path concurrently; on_result(CloneResult) is called from worker threads as each finishes.
+    Returns the results in url order.
+    """
+    def run(url):
+        try:
+            result = clone_one(url, base_path, options)
+        except Exception as e:
+            result = CloneResult(url, os.path.join(base_path, repo_name_from_url(url)), False, str(e))
+        if on_result:
+            on_result(result)
+        return result
+
+    urls, taken = list(dict.fromkeys(urls)), {}
+    for url in urls:
+        taken.setdefault(repo_name_from_url(url), url)
+    if not urls:
+        return []
+
+    def run_unique(url):
+        name = repo_name_from_url(url)
+        if taken[name] != url:
+            # Two URLs ending in the same name would race for one folder
+            result = CloneResult(url, os.path.join(base_path, name), False, f"'{name}' is also cloned from {taken[name]}")
+            if on_result:
+                on_result(result)
+            return result
+        return run(url)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls)), thread_name_prefix="clone") as pool:
+        return list(pool.map(run_unique, urls))
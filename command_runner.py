@@ -0,0 +1,207 @@
+import os
+import re
+import shlex
+import signal
+import subprocess
+import threading
+import time
+import tkinter as tk
+import worker
+
+# COMMAND RUNNER - shell commands (or argv steps) run in their own process group on a reader thread.
+# Output streams into the right panel line by line, git's --progress percentages
+# drive the progress bar, and Cancel kills the whole group (e.g. `a && b && c`).
+PROGRESS_RE = re.compile(rb"(?:^|\s)(\d{1,3})%")
+READ_SIZE = 4096
+
+_current = None  # the one RunningCommand allowed at a time
+
+def is_running():
+    return _current is not None and _current.returncode is None
+
+def split_output(buffer):
+    """
+    Splits raw output on \\n and \\r. Returns ([(line, is_progress)], leftover):
+    \\r-terminated lines are git redrawing its progress meter in place.
+    """
+    lines, start = [], 0
+    for match in re.finditer(rb"\r\n|\n|\r", buffer):
+        lines.append((buffer[start:match.start()], match.group() == b"\r"))
+        start = match.end()
+    return lines, buffer[start:]
+
+def progress_percent(line):
+    match = PROGRESS_RE.search(line)
+    return min(int(match.group(1)), 100) if match else None
+
+def describe(command):
+    return command if isinstance(command, str) else " ".join(shlex.quote(arg) for arg in command)
+
+class RunningCommand:
+    """
+    Runs steps [(label, command, stdin_bytes)] one after another, stopping at the first failure.
+    A str command goes through the shell; a list is run directly. Each step is timed under its label.
+    """
+    def __init__(self, steps, cwd, globals_dict, on_done, timings=None):
+        self.steps, self.cwd = steps, cwd
+        self.globals_dict = globals_dict
+        self.on_done = on_done
+        self.timings = list(timings or [])
+        self.returncode = None
+        self.cancelled = False
+        self.process = None
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        threading.Thread(target=self._run, name="command-output", daemon=True).start()
+
+    def cancel(self):
+        with self._lock:
+            if self.returncode is not None or self.cancelled:
+                return
+            self.cancelled = True
+            if self.process is None:
+                return
+            try:
+                if os.name == 'posix':
+                    os.killpg(self.process.pid, signal.SIGTERM)
+                else:
+                    self.process.terminate()
+            except OSError:
+                pass
+
+    def _spawn(self, command, stdin):
+        return subprocess.Popen(command, cwd=self.cwd, shell=isinstance(command, str),
+                                stdin=subprocess.DEVNULL if stdin is None else subprocess.PIPE,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                start_new_session=(os.name == 'posix'))
+
+    def _run(self):
+        returncode = 0
+        for index, (label, command, stdin) in enumerate(self.steps):
+            if index:
+                worker.call_soon(self._append_command, command)
+            step_started = time.monotonic()
+            with self._lock:
+                if self.cancelled:
+                    break
+                try:
+                    self.process = process = self._spawn(command, stdin)
+                except OSError as e:
+                    worker.call_soon(self._append, [f"Could not start: {e}"])
+                    returncode = 127
+                    break
+            if stdin is not None:
+                # Fed from its own thread so a chatty step can't deadlock on a full output pipe
+                threading.Thread(target=self._feed, args=(process, stdin), daemon=True).start()
+            self._read(process)
+            returncode = process.wait()
+            if label:
+                self.timings.append((label, time.monotonic() - step_started))
+            if returncode != 0 or self.cancelled:
+                break
+        worker.call_soon(self._finish, returncode)
+
+    @staticmethod
+    def _feed(process, data):
+        try:
+            process.stdin.write(data)
+            process.stdin.close()
+        except OSError:
+            pass
+
+    def _read(self, process):
+        buffer, last_percent = b"", None
+        while True:
+            chunk = process.stdout.read1(READ_SIZE)
+            if not chunk:
+                break
+            lines, buffer = split_output(buffer + chunk)
+            text = []
+            for line, is_progress in lines:
+                percent = progress_percent(line)
+                if percent is not None and percent != last_percent:
+                    last_percent = percent
+                    worker.call_soon(self._show_progress, percent, line.decode("utf-8", "replace").strip())
+                if not is_progress:
+                    text.append(line.decode("utf-8", "replace"))
+            if text:
+                worker.call_soon(self._append, text)
+        if buffer:
+            worker.call_soon(self._append, [buffer.decode("utf-8", "replace")])
+        process.stdout.close()
+
+    # Main loop only from here down
+    def _append_command(self, command):
+        text_editor = self.globals_dict['text_editor']
+        text_editor.insert('end', f"\n$ {describe(command)}\n", "bold_medium")
+        text_editor.see('end')
+
+    def _append(self, lines):
+        text_editor = self.globals_dict['text_editor']
+        for line in lines:
+            text_editor.insert('end', f"{line}\n", "normal")
+        text_editor.see('end')
+
+    def _show_progress(self, percent, line):
+        set_progress(self.globals_dict, percent, line)
+
+    def _finish(self, returncode):
+        self.returncode = returncode
+        elapsed = time.monotonic() - self.started
+        if self.cancelled:
+            result, tag = f"✖ Cancelled after {elapsed:.1f}s", "bold_medium"
+        elif returncode == 0:
+            result, tag = f"✔ Finished in {elapsed:.1f}s", "bold_medium"
+        else:
+            result, tag = f"✖ Failed with exit status {returncode} after {elapsed:.1f}s", "bold_medium"
+        text_editor = self.globals_dict['text_editor']
+        text_editor.insert('end', f"\n{result}\n", tag)
+        if self.timings:
+            text_editor.insert('end', "Timings: " + " · ".join(f"{label} {seconds:.2f}s" for label, seconds in self.timings) + "\n", "normal")
+        text_editor.see('end')
+        hide_progress(self.globals_dict)
+        self.globals_dict['auth_label'].config(fg="#008000" if returncode == 0 and not self.cancelled else "#FF0000")
+        if self.on_done:
+            self.on_done(returncode == 0 and not self.cancelled)
+
+def show_progress(globals_dict, command, cancellable=True):
+    bar = globals_dict['progress_bar']
+    bar.config(mode="indeterminate", value=0)
+    bar.start(15)
+    globals_dict['progress_label'].config(text=command.split("&&")[0].strip()[:60])
+    globals_dict['cancel_button'].config(state=tk.NORMAL if cancellable else tk.DISABLED)
+    globals_dict['runner_frame'].pack(fill=tk.X, pady=(0, 2), before=globals_dict['editor_frame'])
+
+def set_progress(globals_dict, percent, text=None):
+    bar = globals_dict['progress_bar']
+    if str(bar.cget("mode")) != "determinate":
+        bar.stop()
+    bar.config(mode="determinate", value=percent)
+    if text is not None:
+        globals_dict['progress_label'].config(text=text[-60:])
+
+def hide_progress(globals_dict):
+    globals_dict['progress_bar'].stop()
+    globals_dict['cancel_button'].config(state=tk.DISABLED)
+    globals_dict['runner_frame'].pack_forget()
+
+def run_steps(steps, cwd, globals_dict, on_done=None, timings=None):
+    """
+    Starts steps [(label, command, stdin_bytes)] without blocking the main loop; on_done(succeeded)
+    runs on the main loop afterwards. timings [(label, seconds)] already spent are reported with the rest.
+    """
+    global _current
+    text_editor = globals_dict['text_editor']
+    text_editor.delete(1.0, 'end')
+    text_editor.insert('end', f"$ {describe(steps[0][1])}\n", "bold_medium")
+    text_editor.insert('end', f"  in {cwd}\n\n", "normal")
+    _current = RunningCommand(steps, cwd, globals_dict, on_done, timings)
+    show_progress(globals_dict, steps[0][0] or describe(steps[0][1]))
+    return _current
+
+def run_command(command, cwd, globals_dict, on_done=None):
+    return run_steps([("", command, None)], cwd, globals_dict, on_done)
+
+def cancel_command():
+    if is_running():
+        _current.cancel()
@@ -0,0 +1,49 @@
+import os
+
+# REPO DISCOVERY - finds repos nested under org/team folders with one scandir per directory.
+# Repos are leaves: once a folder has a .git we never look inside it.
+DISCOVERY_DEPTH = 3  # 1 = only folders directly under the base path
+IGNORED_DIRS = {"node_modules", "__pycache__", "venv", ".venv", ".tox", ".cache", "build", "dist", "target"}
+
+def is_repo(path):
+    return os.path.exists(os.path.join(path, ".git"))
+
+def discover_repos(base_path, max_depth=DISCOVERY_DEPTH, ignored=IGNORED_DIRS):
+    """
+    Returns the sorted relative paths ("org/team/repo") of every repo up to max_depth below base_path.
+    Ignored directories are pruned without being opened; hidden ones can be repos but are never descended into.
+    """
+    repos, stack = [], [("", 1)]
+    while stack:
+        rel_dir, depth = stack.pop()
+        try:
+            with os.scandir(os.path.join(base_path, rel_dir) if rel_dir else base_path) as entries:
+                subdirs = [entry for entry in entries if entry.name != ".git" and entry.name not in ignored and entry.is_dir()]
+        except OSError:
+            if not rel_dir:
+                raise
+            continue
+        for entry in subdirs:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if is_repo(entry.path):
+                repos.append(rel)
+            elif depth < max_depth and not entry.name.startswith("."):
+                stack.append((rel, depth + 1))
+    return sorted(repos, key=str.lower)
+
+def build_tree(repos):
+    """
+    Turns repo paths into {parent: [(child, is_repo), ...]} with "" as the root,
+    adding the group folders in between. Groups sort before repos.
+    """
+    children = {"": []}
+    for rel in repos:
+        parts = rel.split("/")
+        for depth in range(1, len(parts) + 1):
+            node, parent = "/".join(parts[:depth]), "/".join(parts[:depth - 1])
+            if node not in children:
+                children[node] = []
+                children.setdefault(parent, []).append((node, depth == len(parts)))
+    for nodes in children.values():
+        nodes.sort(key=lambda node: (node[1], node[0].lower()))
+    return children
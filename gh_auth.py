@@ -0,0 +1,76 @@
+import os
+import subprocess
+import threading
+
+# GITHUB AUTH IDENTITY - looked up once and reused until login/logout invalidates it.
+# gh's own hosts.yml is read directly; `gh auth status` is only spawned when that
+# file can't answer (token from the environment, unusual config, no user recorded).
+GH_HOST = "github.com"
+
+_identity = None
+_lock = threading.Lock()
+
+def gh_config_dir():
+    if os.environ.get("GH_CONFIG_DIR"):
+        return os.environ["GH_CONFIG_DIR"]
+    if os.environ.get("XDG_CONFIG_HOME"):
+        return os.path.join(os.environ["XDG_CONFIG_HOME"], "gh")
+    if os.name == 'nt' and os.environ.get("AppData"):
+        return os.path.join(os.environ["AppData"], "GitHub CLI")
+    return os.path.join(os.path.expanduser("~"), ".config", "gh")
+
+def read_hosts_user(host=GH_HOST):
+    """
+    Pulls `user:` out of the host's block in hosts.yml, e.g.
+
+        github.com:
+            git_protocol: https
+            user: octocat
+    """
+    try:
+        with open(os.path.join(gh_config_dir(), "hosts.yml"), 'r') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return ""
+    in_host, key_indent = False, None
+    for line in lines:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip())
+        if indent == 0:
+            in_host = line.strip().rstrip(":").strip("'\"") == host
+            key_indent = None
+            continue
+        if not in_host:
+            continue
+        key_indent = indent if key_indent is None else key_indent
+        key, _, value = line.strip().partition(":")
+        if indent == key_indent and key == "user" and value.strip():
+            return value.strip().strip("'\"")
+    return ""
+
+def query_gh_user(host=GH_HOST):
+    try:
+        result = subprocess.run(["gh", "auth", "status", "--hostname", host], stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, text=True)
+    except OSError:
+        return ""
+    for line in result.stdout.splitlines():
+        # "Logged in to github.com as octocat" (older gh) / "... account octocat (keyring)" (newer)
+        for marker in (f"Logged in to {host} as ", f"Logged in to {host} account "):
+            if marker in line:
+                return line.split(marker, 1)[1].split()[0].strip()
+    return ""
+
+def username():
+    global _identity
+    with _lock:
+        if _identity is None:
+            token_in_env = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+            _identity = (not token_in_env and read_hosts_user()) or query_gh_user()
+        return _identity
+
+def invalidate():
+    global _identity
+    with _lock:
+        _identity = None
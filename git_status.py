@@ -0,0 +1,167 @@
+import subprocess
+from dataclasses import dataclass, field
+from objects import ObjectError, last_commit_line
+from refs import read_refs
+
+# STATUS BACKEND - one porcelain status call per repo; branches and the last commit come from
+# refs.py/objects.py, with for-each-ref as the fallback. Everything is parsed from
+# machine-readable output, never from translated messages.
+
+STATUS_WORDS = {"M": "modified", "T": "typechange", "A": "new file", "D": "deleted",
+                "R": "renamed", "C": "copied", "U": "unmerged"}
+
+REF_FORMAT = "%(HEAD)%00%(refname:short)%00%(objectname)%00%(subject)%00%(authorname)%00%(authordate:relative)"
+
+@dataclass
+class RepoStatus:
+    path: str
+    branch: str = ""
+    oid: str = ""
+    upstream: str = ""
+    ahead: int = 0
+    behind: int = 0
+    staged: list = field(default_factory=list)
+    unstaged: list = field(default_factory=list)
+    untracked: list = field(default_factory=list)
+    conflicts: list = field(default_factory=list)
+    last_commit: str = ""
+    branches: list = field(default_factory=list)
+
+    @property
+    def has_commits(self):
+        return bool(self.oid) and self.oid != "(initial)"
+
+    @property
+    def detached(self):
+        return self.branch == "(detached)"
+
+    @property
+    def is_dirty(self):
+        """Tracked changes (staged, unstaged or conflicted); untracked files alone don't count."""
+        return bool(self.staged or self.unstaged or self.conflicts)
+
+    @property
+    def is_clean(self):
+        return not (self.is_dirty or self.untracked)
+
+def _git(args, cwd):
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return 1, b""
+    return result.returncode, result.stdout
+
+def parse_porcelain_v2(status, data):
+    """
+    Fills status from `git status --porcelain=v2 --branch -z` output.
+    """
+    fields = data.decode("utf-8", "surrogateescape").split("\0")
+    i = 0
+    while i < len(fields):
+        record = fields[i]
+        i += 1
+        if not record:
+            continue
+        kind = record[0]
+        if kind == "#":
+            key, _, value = record[2:].partition(" ")
+            if key == "branch.oid": status.oid = value
+            elif key == "branch.head": status.branch = value
+            elif key == "branch.upstream": status.upstream = value
+            elif key == "branch.ab":
+                ahead, behind = value.split()
+                status.ahead, status.behind = int(ahead), abs(int(behind))
+        elif kind in "12":
+            parts = record.split(" ", 9 if kind == "2" else 8)
+            xy, path = parts[1], parts[-1]
+            if kind == "2":
+                path = f"{fields[i]} -> {path}"
+                i += 1
+            if xy[0] != ".": status.staged.append((xy[0], path))
+            if xy[1] != ".": status.unstaged.append((xy[1], path))
+        elif kind == "u":
+            status.conflicts.append(record.split(" ", 10)[-1])
+        elif kind == "?":
+            status.untracked.append(record[2:])
+    return status
+
+def parse_refs(status, data):
+    """
+    Fills the branch list and last commit from `git for-each-ref` output.
+    """
+    for line in data.decode("utf-8", "replace").splitlines():
+        parts = line.split("\0")
+        if len(parts) != 6:
+            continue
+        head, name, oid, subject, author, date = parts
+        status.branches.append(f"{'*' if head == '*' else ' '} {name}")
+        if not status.last_commit and (head == "*" or (status.detached and oid == status.oid)):
+            status.last_commit = f"{oid[:7]} - {subject} ({author}, {date})"
+    return status
+
+def read_repo_status(full_path, with_refs=True):
+    status = RepoStatus(path=full_path)
+    code, out = _git(["--no-optional-locks", "status", "--porcelain=v2", "--branch", "-z", "--untracked-files=normal"], full_path)
+    if code == 0:
+        parse_porcelain_v2(status, out)
+    if not with_refs or not status.has_commits:
+        return status
+    try:
+        # Branch list and last commit straight from .git; no processes on the common path
+        refs = read_refs(full_path)
+        status.last_commit = last_commit_line(full_path, status.oid)
+        status.branches = [f"{'*' if name == refs.current else ' '} {name}" for name in sorted(refs.local)]
+        return status
+    except ObjectError:
+        pass
+    code, out = _git(["for-each-ref", f"--format={REF_FORMAT}", "refs/heads"], full_path)
+    if code == 0:
+        parse_refs(status, out)
+    if not status.last_commit:
+        # Detached on a commit no branch points at
+        code, out = _git(["log", "-1", "--pretty=format:%h - %s (%an, %ar)"], full_path)
+        status.last_commit = out.decode("utf-8", "replace") if code == 0 else ""
+    return status
+
+def status_lines(status):
+    """
+    Right panel text for a RepoStatus, as (text, tag) pairs; each file list is a nested list so long ones collapse.
+    """
+    if status.detached:
+        headline = f"HEAD detached at {status.oid[:7]}"
+    elif not status.has_commits:
+        headline = f"No commits yet on {status.branch}"
+    else:
+        headline = f"On branch {status.branch}"
+    lines = [(f"Status: {headline}", "bold_medium"), ("", "normal")]
+    if status.upstream:
+        if status.ahead or status.behind:
+            lines.append((f"    Tracking {status.upstream}: ahead {status.ahead}, behind {status.behind}", "normal"))
+        else:
+            lines.append((f"    Up to date with {status.upstream}", "normal"))
+    elif status.has_commits and not status.detached:
+        lines.append(("    No upstream branch", "normal"))
+    counts = f"    Staged: {len(status.staged)}   Unstaged: {len(status.unstaged)}   Untracked: {len(status.untracked)}"
+    lines.append((counts + (f"   Conflicts: {len(status.conflicts)}" if status.conflicts else ""), "normal"))
+    if status.is_clean:
+        lines.append(("    Nothing to commit, working tree clean", "normal"))
+    for title, entries in (("Changes to be committed:", status.staged), ("Changes not staged for commit:", status.unstaged)):
+        if entries:
+            lines.append((f"  {title}", "normal"))
+            lines.append([(f"    {STATUS_WORDS.get(code, code)}:   {path}", "normal") for code, path in entries])
+    if status.conflicts:
+        lines.append(("  Unmerged paths:", "normal"))
+        lines.append([(f"    both modified:   {path}", "normal") for path in status.conflicts])
+    if status.untracked:
+        lines.append(("  Untracked files:", "normal"))
+        lines.append([(f"    {path}", "normal") for path in status.untracked])
+    return lines
+
+def repo_badge(status):
+    """
+    Short treeview badge: ● for uncommitted changes, ↑N/↓N against upstream, ✓ when clean and in sync.
+    """
+    parts = [] if status.is_clean else ["●"]
+    if status.ahead: parts.append(f"↑{status.ahead}")
+    if status.behind: parts.append(f"↓{status.behind}")
+    return " ".join(parts) or "✓"
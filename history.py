@@ -0,0 +1,211 @@
+import os
+import struct
+import subprocess
+import threading
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+import worker
+from objects import relative_date, resolve_git_dirs
+from refs import read_head
+
+# HISTORY VIEW - `git log` streams through a pipe and is only read PAGE_SIZE commits past
+# what the view needs; git blocks on the full pipe in between. Rows are cached per
+# (repo, HEAD), and the window only ever holds VISIBLE_ROWS treeview items, relabelled as
+# it scrolls. The scrollbar is sized from the commit-graph until the real count arrives.
+PAGE_SIZE = 200
+VISIBLE_ROWS = 30
+HISTORY_CACHE_SIZE = 8
+LOG_FORMAT = "%H%x00%an%x00%ct%x00%s"
+
+def commit_graph_count(full_path):
+    """
+    Commits recorded in the repo's commit-graph (single file or split chain), or None without one.
+    Counts every commit in the graph, so it's an upper bound for HEAD's history.
+    """
+    try:
+        info = os.path.join(resolve_git_dirs(full_path)[1], "objects", "info")
+    except Exception:
+        return None
+    chain = os.path.join(info, "commit-graphs", "commit-graph-chain")
+    if os.path.isfile(chain):
+        with open(chain, 'r') as f:
+            files = [os.path.join(info, "commit-graphs", f"graph-{line.strip()}.graph") for line in f if line.strip()]
+    else:
+        files = [os.path.join(info, "commit-graph")]
+    total = 0
+    for path in files:
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(8)
+                if header[:4] != b"CGPH":
+                    return None
+                table = f.read((header[6] + 1) * 12)
+                for i in range(header[6]):
+                    chunk_id, offset = struct.unpack_from(">4sQ", table, i * 12)
+                    if chunk_id == b"OIDF":
+                        f.seek(offset + 255 * 4)
+                        total += struct.unpack(">I", f.read(4))[0]
+                        break
+        except (OSError, struct.error, IndexError):
+            return None
+    return total
+
+def count_commits(full_path, head):
+    result = subprocess.run(["git", "rev-list", "--count", head, "--"], cwd=full_path,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return int(result.stdout) if result.returncode == 0 and result.stdout.strip().isdigit() else None
+
+class LogStream:
+    """
+    Rows (oid, author, commit time, subject) of `git log head`, read as far as asked and no further.
+    A closed stream keeps its rows and resumes with --skip when asked for more.
+    """
+    def __init__(self, full_path, head):
+        self.full_path, self.head = full_path, head
+        self.rows = []
+        self.done = False
+        self.closed = False
+        self.process = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self.process = subprocess.Popen(["git", "log", f"--format={LOG_FORMAT}", f"--skip={len(self.rows)}", self.head, "--"],
+                                        cwd=self.full_path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def fill(self, count):
+        """Worker thread: reads until count rows are loaded or history ends. Returns the number loaded."""
+        with self._lock:
+            if self.closed and self.process is not None:
+                self.process.wait()  # killed by close(); resume below with --skip
+                self.process = None
+            self.closed = False
+            while len(self.rows) < count and not self.done and not self.closed:
+                if self.process is None:
+                    self._start()
+                line = self.process.stdout.readline()
+                if not line:
+                    self.process.wait()
+                    self.done = not self.closed  # end of history, or git failed; either way nothing more to read
+                    self.process = None
+                    break
+                parts = line.rstrip(b"\n").split(b"\0", 3)
+                if len(parts) == 4:
+                    oid, author, when, subject = (part.decode("utf-8", "replace") for part in parts)
+                    self.rows.append((oid, author, int(when or 0), subject))
+            return len(self.rows)
+
+    def close(self):
+        self.closed = True
+        process = self.process
+        if process is not None:
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+_streams = OrderedDict()  # (repo path, head oid) -> LogStream
+
+def history_stream(full_path, head):
+    key = (full_path, head)
+    stream = _streams.pop(key, None) or LogStream(full_path, head)
+    _streams[key] = stream
+    while len(_streams) > HISTORY_CACHE_SIZE:
+        _streams.popitem(last=False)[1].close()
+    return stream
+
+class HistoryWindow(tk.Toplevel):
+    def __init__(self, parent, full_path):
+        super().__init__(parent)
+        self.full_path = full_path
+        self.title(f"History - {os.path.basename(full_path)}")
+        self.head = read_head(full_path)
+        self.stream = history_stream(full_path, self.head)
+        self.estimate = commit_graph_count(full_path)
+        self.exact = None
+        self.first = 0
+        self.key = f"history:{id(self)}"
+
+        frame = tk.Frame(self)
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.rows = ttk.Treeview(frame, columns=("oid", "subject", "author", "date"), show="headings",
+                                 height=VISIBLE_ROWS, selectmode="browse")
+        for column, text, width in (("oid", "Commit", 70), ("subject", "Subject", 420), ("author", "Author", 140), ("date", "Date", 130)):
+            self.rows.heading(column, text=text)
+            self.rows.column(column, width=width, stretch=column == "subject")
+        for i in range(VISIBLE_ROWS):
+            self.rows.insert("", "end", iid=f"row{i}", values=("", "", "", ""))
+        self.rows.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.status = tk.Label(self, anchor="w")
+        self.status.pack(fill=tk.X)
+        self.resizable(True, False)
+
+        for sequence, delta in (("<Button-4>", -3), ("<Button-5>", 3), ("<Prior>", -VISIBLE_ROWS), ("<Next>", VISIBLE_ROWS)):
+            self.rows.bind(sequence, lambda e, delta=delta: self.scroll_to(self.first + delta))
+        self.rows.bind("<MouseWheel>", lambda e: self.scroll_to(self.first - (3 if e.delta > 0 else -3)))
+        self.rows.bind("<Home>", lambda e: self.scroll_to(0))
+        self.rows.bind("<Double-1>", self.copy_oid)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        if not self.head:
+            self.status.config(text="No commits yet")
+            return
+        worker.submit(count_commits, full_path, self.head, callback=self.set_count)
+        self.render()
+
+    def total(self):
+        if self.stream.done:
+            return len(self.stream.rows)
+        if self.exact is not None:
+            return self.exact
+        return max(self.estimate or 0, len(self.stream.rows) + PAGE_SIZE)
+
+    def set_count(self, count):
+        if count is not None and self.winfo_exists():
+            self.exact = count
+            self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.total()))
+        elif action == "scroll":
+            self.scroll_to(self.first + int(amount) * (VISIBLE_ROWS if unit == "pages" else 1))
+        return "break"
+
+    def scroll_to(self, first):
+        self.first = max(0, min(first, self.total() - VISIBLE_ROWS))
+        self.render()
+        return "break"
+
+    def render(self):
+        if not self.winfo_exists():
+            return
+        rows, needed = self.stream.rows, self.first + VISIBLE_ROWS
+        if needed > len(rows) and not self.stream.done:
+            worker.submit(self.stream.fill, needed + PAGE_SIZE, key=self.key, callback=lambda loaded: self.render(),
+                          long=True)
+        for i in range(VISIBLE_ROWS):
+            index = self.first + i
+            if index < len(rows):
+                oid, author, when, subject = rows[index]
+                values = (oid[:7], subject, author, relative_date(when))
+            else:
+                values = ("", "loading..." if not self.stream.done and index == max(len(rows), self.first) else "", "", "")
+            self.rows.item(f"row{i}", values=values)
+        total = max(self.total(), 1)
+        self.scrollbar.set(self.first / total, min(1.0, needed / total))
+        counted = f"{total}" if self.stream.done or self.exact is not None else f"~{total}"
+        self.status.config(text=f"Commits {self.first + 1}-{min(needed, total)} of {counted}   ({len(rows)} loaded)")
+
+    def copy_oid(self, event=None):
+        index = self.first + self.rows.index(self.rows.focus()) if self.rows.focus() else None
+        if index is not None and index < len(self.stream.rows):
+            self.clipboard_clear()
+            self.clipboard_append(self.stream.rows[index][0])
+
+    def close(self):
+        worker.cancel(self.key)
+        self.stream.close()
+        self.destroy()
@@ -1,10 +1,27 @@
+import itertools
 import json
 import os
 import subprocess
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox, simpledialog, ttk
 import tkinter as tk
+import worker
+import command_runner
+import change_tree
+import gh_auth
+from watcher import RepoWatcher
+from discovery import discover_repos, build_tree
+from git_status import read_repo_status, status_lines, repo_badge
+from objects import ObjectError, resolve_git_dirs
+import visibility
+import repo_store
+from visibility import query_repo_visibility, resolve_visibilities
 
 STATE_FILE = "ui_state.json"
+STATUS_CACHE_SIZE = 256
+STATUS_CACHE_MAX_AGE = 30  # seconds; in-place file edits don't touch any .git mtime
 
 def center_window_on_parent(window, parent):
     """
@@ -142,24 +159,248 @@ def load_state():
                 return 200, "", 600, 400, None, None, "#000000", "#f0f0f0", "#ffffff", "#ffffff", 10
     return 200, "", 600, 400, None, None, "#000000", "#f0f0f0", "#ffffff", "#ffffff", 10
 
-# UPDATE TREEVIEW CLEARS ALL SELECTIONS WHEN REFRESHING LIST
-def update_treeview(entry, treeview, event=None):
-    path = entry.get().strip()
+# UPDATE TREEVIEW - rows are keyed by the repo path relative to the base ("org/team/repo") and
+# reconciled in place, so selection and scroll survive a refresh. Group folders only get
+# their children materialized the first time they are opened.
+MESSAGE_ROW = "__message__"
+PLACEHOLDER = "::placeholder"
+MORE_ROW = "::more"
+PAGE_SIZE = 200  # rows materialized per parent before a "▼ N more" row
+_repo_tree = {"base": "", "repos": [], "children": {"": []}, "index": [], "pages": {},
+              "filter": "", "last_filter": "", "matches": [], "selection": ()}
+
+def repo_row_label(full_path, item):
+    is_private = repo_store.lookup(full_path)[0]
+    prefix = "⏳ " if is_private is None else ("🔒 " if is_private else "🌍 ")
+    badge = _badges.get(full_path, (None, ""))[1]
+    return f"{prefix}{item}  {badge}" if badge else f"{prefix}{item}"
+
+def repo_row(base_path, node, is_repo):
+    name = node.rsplit("/", 1)[-1]
+    if is_repo:
+        return node, repo_row_label(os.path.join(base_path, node), name), (node,)
+    return node, f"📁 {name}", ()
+
+def repo_paths():
+    return [os.path.join(_repo_tree["base"], rel) for rel in _repo_tree["repos"]]
+
+def repo_rel(base_path, full_path):
+    return os.path.relpath(full_path, base_path).replace(os.sep, "/")
+
+def selected_repo(treeview, item=None):
+    item = item or (treeview.selection() or ("",))[0]
+    values = treeview.item(item)["values"] if item and treeview.exists(item) else ""
+    return str(values[0]) if values else ""
+
+def selected_repos(treeview):
+    """Repo paths of every selected row, skipping group folders and paging rows."""
+    return [rel for rel in (selected_repo(treeview, item) for item in treeview.selection()) if rel]
+
+def reconcile_rows(treeview, parent, rows):
+    """
+    Makes parent's children match rows [(iid, text, values)], touching only rows that changed.
+    """
+    wanted = {iid for iid, _, _ in rows}
+    stale = [child for child in treeview.get_children(parent) if child not in wanted]
+    if stale:
+        treeview.delete(*stale)
+    for iid, text, values in rows:
+        if not treeview.exists(iid):
+            treeview.insert(parent, "end", iid=iid, text=text, values=values)
+            continue
+        if treeview.parent(iid) != parent:
+            # Same repo row moving between the filtered (flat) and tree layouts
+            treeview.move(iid, parent, "end")
+        if treeview.item(iid, "text") != text:
+            treeview.item(iid, text=text)
+    order = tuple(iid for iid, _, _ in rows)
+    if treeview.get_children(parent) != order:
+        treeview.set_children(parent, *order)
+
+def paged_rows(parent, items, make_row):
+    # Only the current page of a parent is ever turned into Treeview items
+    limit = _repo_tree["pages"].get(parent, PAGE_SIZE)
+    rows = [make_row(item) for item in items[:limit]]
+    if len(items) > limit:
+        rows.append((parent + MORE_ROW, f"▼ {len(items) - limit} more...", ()))
+    return rows
+
+def show_more_rows(treeview, more_row):
+    parent = more_row[:-len(MORE_ROW)]
+    _repo_tree["pages"][parent] = _repo_tree["pages"].get(parent, PAGE_SIZE) + PAGE_SIZE
+    # Put back what was selected before the paging row; an empty selection would blank the right panel
+    previous = [iid for iid in _repo_tree["selection"] if treeview.exists(iid)]
+    if previous:
+        treeview.selection_set(previous)
+    else:
+        treeview.selection_remove(more_row)
+    if _repo_tree["filter"]:
+        render_repo_tree(treeview)
+    else:
+        reconcile_group(treeview, _repo_tree["base"], parent)
+
+def reconcile_group(treeview, base_path, parent):
+    nodes = _repo_tree["children"].get(parent, [])
+    reconcile_rows(treeview, parent, paged_rows(parent, nodes, lambda node: repo_row(base_path, *node)))
+    for node, is_repo in nodes[:_repo_tree["pages"].get(parent, PAGE_SIZE)]:
+        if is_repo:
+            continue
+        children = treeview.get_children(node)
+        if not children:
+            treeview.insert(node, "end", iid=node + PLACEHOLDER, text="...")
+        elif children[0] != node + PLACEHOLDER:
+            reconcile_group(treeview, base_path, node)
+
+def expand_group(treeview, node):
+    # <<TreeviewOpen>>: swap the placeholder for the real children on first open
+    if node and treeview.exists(node + PLACEHOLDER):
+        treeview.delete(node + PLACEHOLDER)
+        reconcile_group(treeview, _repo_tree["base"], node)
+
+def show_treeview_message(treeview, message):
     treeview.delete(*treeview.get_children())
+    treeview.insert("", "end", iid=MESSAGE_ROW, text=message)
+
+def apply_discovery(treeview, path, repos):
+    """
+    Swaps in a fresh discovery of path and re-renders. Returns (added, removed) full paths.
+    """
+    before = set(repo_paths()) if path == _repo_tree["base"] else set()
+    if path != _repo_tree["base"]:
+        _repo_tree["pages"] = {}
+    _repo_tree.update(base=path, repos=repos, children=build_tree(repos), last_filter="", matches=[],
+                      index=[(rel.lower(), rel, rel.lower().rsplit("/", 1)[-1]) for rel in repos])
+    render_repo_tree(treeview)
+    after = set(repo_paths())
+    for gone in before - after:
+        _badges.pop(gone, None)
+    return sorted(after - before), sorted(before - after)
+
+def group_paths():
+    """Full paths of the org/team folders holding discovered repos."""
+    return [os.path.join(_repo_tree["base"], node) for nodes in _repo_tree["children"].values()
+            for node, is_repo in nodes if not is_repo]
+
+_discovery = {"waiting": [], "badges": False, "force": False}
+
+def update_treeview(entry, treeview, event=None, force_badges=False, badges=True, on_done=None):
+    """
+    Re-discovers the repos under the entry's path on the worker pool; the tree keeps its rows until the
+    scan lands. badges=False only badges repos that weren't listed before. on_done(added, removed) runs
+    with the full paths once the tree is updated; calls made while a scan is in flight share its result.
+    """
+    path = entry.get().strip()
     if not os.path.isdir(path):
-        treeview.insert("", "end", text="Invalid directory path")
+        show_treeview_message(treeview, "Invalid directory path")
         return
-    
-    try:
-        items = sorted([item for item in os.listdir(path) if os.path.isdir(os.path.join(path, item))])
-        repo_status = load_repo_status()
-        for item in items:
-            if os.path.isdir(os.path.join(path, item, ".git")):
-                full_path = os.path.join(path, item)
-                prefix = "🔒 " if repo_status.get(full_path, False) else "🌍 "
-                treeview.insert("", "end", text=f"{prefix}{item}", values=(item,))
-    except OSError:
-        treeview.insert("", "end", text="Error accessing directory")
+    if path != _repo_tree["base"] or not treeview.get_children():
+        show_treeview_message(treeview, "Scanning...")
+    if on_done:
+        _discovery["waiting"].append(on_done)
+    _discovery["badges"] = _discovery["badges"] or badges
+    _discovery["force"] = _discovery["force"] or force_badges
+
+    def on_discovered(repos):
+        waiting, refresh_all, force = _discovery["waiting"], _discovery["badges"], _discovery["force"]
+        _discovery.update(waiting=[], badges=False, force=False)
+        if entry.get().strip() != path:
+            return
+        added, removed = apply_discovery(treeview, path, repos)
+        if refresh_all:
+            refresh_badges(treeview, force=force)
+        elif added:
+            refresh_badges(treeview, added)
+        for callback in waiting:
+            callback(added, removed)
+
+    def on_error(e):
+        _discovery.update(waiting=[], badges=False, force=False)
+        if entry.get().strip() == path:
+            show_treeview_message(treeview, "Error accessing directory")
+
+    worker.submit(discover_repos, path, key="discover_repos", callback=on_discovered, on_error=on_error)
+
+# BADGES - clean/dirty/ahead/behind for every repo, computed BADGE_WORKERS at a time off the
+# main thread and streamed into the rows. A repo whose .git stat fingerprint hasn't moved
+# since its last badge is skipped without spawning git, for up to STATUS_CACHE_MAX_AGE:
+# in-place edits to tracked files don't touch .git, so older badges are always re-checked.
+BADGE_WORKERS = 8
+_badges = {}  # full path -> (fingerprint, badge, checked at)
+_badge_generation = [0]
+
+def set_badge(treeview, full_path, fingerprint, badge):
+    unchanged = _badges.get(full_path, (None, None))[:2] == (fingerprint, badge)
+    _badges[full_path] = (fingerprint, badge, time.monotonic())
+    if unchanged:
+        return
+    base_path = _repo_tree["base"]
+    if full_path.startswith(base_path):
+        refresh_repo_row(treeview, base_path, repo_rel(base_path, full_path))
+
+def compute_badges(treeview, paths, known, generation=None):
+    # RUNS ON A WORKER THREAD - results go back through worker.call_soon
+    def badge_one(full_path):
+        if generation is not None and generation != _badge_generation[0]:
+            return
+        fingerprint = status_fingerprint(full_path)
+        seen, checked = known.get(full_path, (None, 0.0))
+        if seen == fingerprint and time.monotonic() - checked < STATUS_CACHE_MAX_AGE:
+            return
+        badge = repo_badge(read_repo_status(full_path, with_refs=False))
+        worker.call_soon(set_badge, treeview, full_path, fingerprint, badge)
+    with ThreadPoolExecutor(max_workers=BADGE_WORKERS, thread_name_prefix="badge") as pool:
+        list(pool.map(badge_one, paths))
+
+def refresh_badges(treeview, paths=None, force=False):
+    """
+    Revalidates badges for paths, or for every discovered repo (superseding any full pass still running).
+    force re-reads every repo's status, fingerprint or not.
+    """
+    generation = None
+    if paths is None:
+        paths = repo_paths()
+        _badge_generation[0] += 1
+        generation = _badge_generation[0]
+        for stale in set(_badges) - set(paths):
+            del _badges[stale]
+    known = {} if force else {path: (_badges[path][0], _badges[path][2]) for path in paths if path in _badges}
+    worker.submit(compute_badges, treeview, list(paths), known, generation, long=True)
+
+# TYPE-AHEAD FILTER - substring match over the in-memory index, never the disk. Plain queries
+# match the repo's own folder name, so typing a group name doesn't list everything under it;
+# queries with a "/" match the whole relative path. A query that extends the previous one
+# (in the same mode) only re-checks the previous matches.
+def filter_repos(query):
+    last = _repo_tree["last_filter"]
+    by_path = "/" in query
+    if last and query.startswith(last) and ("/" in last) == by_path:
+        candidates = _repo_tree["matches"]
+    else:
+        candidates = _repo_tree["index"]
+    matches = [row for row in candidates if query in (row[0] if by_path else row[2])]
+    _repo_tree.update(last_filter=query, matches=matches)
+    # Repos whose own folder name starts with the query first; the index is already sorted
+    return [rel for _, rel, leaf in matches if leaf.startswith(query)] + [rel for _, rel, leaf in matches if not leaf.startswith(query)]
+
+def render_repo_tree(treeview):
+    base_path, query = _repo_tree["base"], _repo_tree["filter"]
+    if not query:
+        reconcile_group(treeview, base_path, "")
+        return
+    reconcile_rows(treeview, "", paged_rows("", filter_repos(query),
+                                            lambda rel: (rel, repo_row_label(os.path.join(base_path, rel), rel), (rel,))))
+
+def apply_filter(filter_entry, treeview, event=None):
+    query = filter_entry.get().strip().lower()
+    if query == _repo_tree["filter"] or treeview.exists(MESSAGE_ROW):
+        return
+    _repo_tree.update(filter=query, pages={})
+    render_repo_tree(treeview)
+
+def refresh_repo_row(treeview, base_path, rel):
+    if treeview.exists(rel):
+        name = rel if _repo_tree["filter"] else rel.rsplit("/", 1)[-1]
+        treeview.item(rel, text=repo_row_label(os.path.join(base_path, rel), name))
 
 def clear_entry(entry, treeview):
     entry.delete(0, 'end')
@@ -173,85 +414,233 @@ def run_git_command(command, cwd, default_output=""):
         return default_output if not e.output else e.output
 
 def check_git_status(full_path):
-    status_output = run_git_command(["git", "status"], full_path)
-    return "nothing to commit, working tree clean" in status_output
+    return read_repo_status(full_path, with_refs=False).is_clean
+
+# RIGHT PANEL TEXT - tags are configured once per widget and each render is one batched
+# insert of (text, tag) pairs, consecutive lines with the same tag joined into one chunk.
+# Sections (lists of lines) longer than EDITOR_SECTION_LIMIT stop at a "▼ N more files..."
+# line that inserts the next EDITOR_SECTION_LIMIT lines in place when clicked.
+EDITOR_TAGS = {
+    "bold_large": ("TkDefaultFont", 12, "bold"),
+    "bold_medium": ("TkDefaultFont", 10, "bold"),
+    "bold_larger": ("TkDefaultFont", 14, "bold"),
+    "normal": ("TkDefaultFont", 9),
+}
+EDITOR_SECTION_LIMIT = 200
+MORE_LINES = "more_lines"
+_tagged_editors = set()
+_collapsed = {}  # editor name -> {more tag: lines not shown yet}
+_more_ids = itertools.count()
+
+def configure_editor_tags(text_editor):
+    if str(text_editor) in _tagged_editors:
+        return
+    for tag, font in EDITOR_TAGS.items():
+        text_editor.tag_configure(tag, font=font)
+    text_editor.tag_configure(MORE_LINES, font=EDITOR_TAGS["normal"], foreground="#1E6FD9", underline=True)
+    text_editor.tag_bind(MORE_LINES, "<Enter>", lambda e: text_editor.config(cursor="hand2"))
+    text_editor.tag_bind(MORE_LINES, "<Leave>", lambda e: text_editor.config(cursor=""))
+    _tagged_editors.add(str(text_editor))
+
+def _insert_args(lines):
+    """Flattens lines into insert()'s text, tag, text, tag... arguments."""
+    args, chunk, chunk_tag = [], [], None
+    for line in lines:
+        text, tag = line if isinstance(line, tuple) else (line, "normal")
+        if tag != chunk_tag and chunk:
+            args += ["".join(chunk), chunk_tag]
+            chunk = []
+        chunk.append(f"{text}\n")
+        chunk_tag = tag
+    if chunk:
+        args += ["".join(chunk), chunk_tag]
+    return args
+
+def _section_args(text_editor, lines):
+    """Insert arguments for a section's first EDITOR_SECTION_LIMIT lines plus a "more" line for the rest."""
+    args = _insert_args(lines[:EDITOR_SECTION_LIMIT])
+    rest = lines[EDITOR_SECTION_LIMIT:]
+    if rest:
+        hidden = _collapsed.setdefault(str(text_editor), {})
+        tag = f"{MORE_LINES}_{next(_more_ids)}"
+        hidden[tag] = rest
+        text_editor.tag_bind(tag, "<Button-1>", lambda e: show_more_lines(text_editor, tag))
+        args += [f"    ▼ {len(rest)} more files...\n", (MORE_LINES, tag)]
+    return args
+
+def show_more_lines(text_editor, tag):
+    rest = _collapsed.get(str(text_editor), {}).pop(tag, None)
+    ranges = text_editor.tag_ranges(tag)
+    if rest is None or not ranges:
+        return "break"
+    start = text_editor.index(ranges[0])
+    text_editor.delete(start, ranges[1])
+    # Deleting the tag drops its binding too, so expanded sections don't pile up tags; after_idle
+    # because this runs inside that very binding
+    text_editor.after_idle(text_editor.tag_delete, tag)
+    text_editor.insert(start, *_section_args(text_editor, rest))
+    return "break"
 
 def update_editor(text_editor, lines):
-    text_editor.delete(1.0, 'end')
-    text_editor.tag_configure("bold_large", font=("TkDefaultFont", 12, "bold"))
-    text_editor.tag_configure("bold_medium", font=("TkDefaultFont", 10, "bold"))
-    text_editor.tag_configure("bold_larger", font=("TkDefaultFont", 14, "bold"))
-    text_editor.tag_configure("normal", font=("TkDefaultFont", 9))
+    """
+    Replaces the right panel text. lines holds strings, (text, tag) pairs, and lists of those for collapsible sections.
+    """
+    configure_editor_tags(text_editor)
+    for tag in _collapsed.pop(str(text_editor), {}):
+        text_editor.tag_delete(tag)
+    args, plain = [], []
     for line in lines:
-        if isinstance(line, tuple):
-            text, tag = line
-            text_editor.insert('end', f"{text}\n", tag)
+        if isinstance(line, list):
+            args += _insert_args(plain) + _section_args(text_editor, line)
+            plain = []
         else:
-            text_editor.insert('end', f"{line}\n", "normal")
+            plain.append(line)
+    args += _insert_args(plain)
+    text_editor.delete(1.0, 'end')
+    if args:
+        text_editor.insert('end', *args)
 
-# SIMULATE TREEVIEW / LEFT PANEL CLICK (Updates Right Panel Git Status View)
-def on_treeview_select(entry, treeview, text_editor, auth_label, event=None, update_auth=True):
-    selection = treeview.selection()
-    if not selection or not os.path.isdir(entry.get().strip()):
-        update_editor(text_editor, ["No folder selected" if not selection else "Invalid or non-Git directory"])
-        return None
+# STATUS CACHE - per-repo RepoStatus, reused while the .git stat fingerprint is unchanged
+_status_cache = OrderedDict()
+status_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
 
-    item_values = treeview.item(selection[0])["values"]
-    if not item_values or not os.path.isdir(os.path.join(entry.get().strip(), item_values[0], ".git")):
-        update_editor(text_editor, ["Invalid or non-Git directory"])
+def _mtime(path):
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
         return None
 
-    full_path = os.path.join(entry.get().strip(), item_values[0])
-    commit_exists = run_git_command(["git", "log", "-1"], full_path, "").strip() != ""
-    status_raw = run_git_command(["git", "status"], full_path, "No commits yet") if commit_exists else "No commits yet"
-    status_lines = status_raw.splitlines()
-    status_formatted = [f"**Status: {status_lines[0]}**", ""] + [
-        f"  {line}" if "Changes not staged" in line else f"    {line}"
-        for line in status_lines[1:] if line.strip()
-    ]
-    log = run_git_command(["git", "log", "-1", "--pretty=format:%h - %s (%an, %ar)"], full_path, "No commits") if commit_exists else "No commits"
-    branches = run_git_command(["git", "branch"], full_path, "").splitlines() if commit_exists else []
-    current_branch = "main" if not commit_exists else next((s.split()[-1] for s in status_raw.splitlines() if s.startswith("On branch")), "unknown")
-
-    text_editor.tag_configure("bold_larger", font=("TkDefaultFont", 14, "bold"))
+def status_fingerprint(full_path):
+    try:
+        gdir, common = resolve_git_dirs(full_path)
+    except ObjectError:
+        gdir = common = os.path.join(full_path, ".git")
+    # HEAD and the index are per worktree; refs live in the common dir linked worktrees share
+    paths = [os.path.join(gdir, name) for name in ("HEAD", "index", "FETCH_HEAD")]
+    paths += [os.path.join(common, name) for name in ("packed-refs", "refs", os.path.join("refs", "heads"))]
+    try:
+        with open(os.path.join(gdir, "HEAD"), 'r') as f:
+            head = f.read().strip()
+        if head.startswith("ref: "):
+            paths.append(os.path.join(common, head[5:]))
+    except OSError:
+        pass
+    remotes_dir = os.path.join(common, "refs", "remotes")
+    try:
+        paths += sorted(e.path for e in os.scandir(remotes_dir) if e.is_dir())
+    except OSError:
+        pass
+    return tuple(_mtime(p) for p in paths + [full_path])
+
+def cached_status(full_path, fingerprint):
+    entry = _status_cache.get(full_path)
+    if entry and entry[0] == fingerprint and time.monotonic() - entry[1] < STATUS_CACHE_MAX_AGE:
+        _status_cache.move_to_end(full_path)
+        status_cache_stats["hits"] += 1
+        return entry[2]
+    status_cache_stats["misses"] += 1
+    return None
+
+def store_status(full_path, fingerprint, status):
+    _status_cache[full_path] = (fingerprint, time.monotonic(), status)
+    _status_cache.move_to_end(full_path)
+    while len(_status_cache) > STATUS_CACHE_SIZE:
+        _status_cache.popitem(last=False)
+        status_cache_stats["evictions"] += 1
+
+def invalidate_status(full_path=None):
+    if full_path is None: _status_cache.clear()
+    else: _status_cache.pop(full_path, None)
+
+def auth_suffix(auth_label):
+    parts = auth_label.cget('text').split(' - ', 1)
+    return parts[1] if len(parts) > 1 else ""
+
+def set_auth_status(auth_label, auth_status, fg=None):
+    branch_part = auth_label.cget('text').split(' - ', 1)[0] if ' - ' in auth_label.cget('text') else "● No branch"
+    auth_label.config(text=f"{branch_part} - {auth_status}")
+    if fg: auth_label.config(fg=fg)
+
+def render_repo_status(text_editor, auth_label, status):
+    current_branch = status.branch or "unknown"
     update_editor(text_editor, [
-        (f"Git repo at: {full_path}", "bold_large"),
+        (f"Git repo at: {status.path}", "bold_large"),
         ("", "normal"),
-        (status_formatted[0].replace("**", ""), "bold_medium")
-    ] + [(line, "normal") for line in status_formatted[1:]] + [
+    ] + status_lines(status) + [
         ("", "normal"),
         (f"Branch: {current_branch}", "bold_larger"),
         ("", "normal"),
-        (f"Last Commit: {log}", "bold_medium"),
+        (f"Last Commit: {status.last_commit or 'No commits'}", "bold_medium"),
         ("", "normal"),
-        ("Branches:", "bold_medium")
-    ] + [(branch, "normal") for branch in branches])
-    
-    current_text = auth_label.cget('text')
-    circle_color = "#008000" if "Changes not staged for commit:" not in status_raw else "#FF0000"
-    auth_label.config(text=f"● {current_branch} {'(no commits)' * (not commit_exists)} - {current_text.split(' - ')[1]}", fg=circle_color)
+        ("Branches:", "bold_medium"),
+        [(branch, "normal") for branch in status.branches],
+    ])
+
+    change_tree.show_changes(status)
+    circle_color = "#FF0000" if status.is_dirty else "#008000"
+    auth_label.config(text=f"● {current_branch} {'(no commits)' * (not status.has_commits)} - {auth_suffix(auth_label)}", fg=circle_color)
     return current_branch
 
+# SIMULATE TREEVIEW / LEFT PANEL CLICK (Updates Right Panel Git Status View)
+# Git runs on the worker pool; a newer selection supersedes any query still in flight,
+# so the right panel only ever renders the latest selection.
+def on_treeview_select(entry, treeview, text_editor, auth_label, event=None, update_auth=True):
+    selection = treeview.selection()
+    if selection and selection[0].endswith(MORE_ROW):
+        show_more_rows(treeview, selection[0])
+        return None
+    _repo_tree["selection"] = selection
+    if command_runner.is_running():
+        # The panel is streaming a command's output; re-rendering would wipe it and mix the rest into another repo
+        return None
+    if not selection or not os.path.isdir(entry.get().strip()):
+        worker.cancel("repo_status")
+        change_tree.clear_changes()
+        update_editor(text_editor, ["No folder selected" if not selection else "Invalid or non-Git directory"])
+        return None
+
+    item = selected_repo(treeview)
+    if not item or not os.path.exists(os.path.join(entry.get().strip(), item, ".git")):
+        worker.cancel("repo_status")
+        change_tree.clear_changes()
+        update_editor(text_editor, ["Invalid or non-Git directory"])
+        return None
+
+    full_path = os.path.join(entry.get().strip(), item)
+    fingerprint = status_fingerprint(full_path)
+    status = cached_status(full_path, fingerprint)
+    if status is not None:
+        worker.cancel("repo_status")
+        render_repo_status(text_editor, auth_label, status)
+        return full_path
+
+    def on_status(status):
+        store_status(full_path, fingerprint, status)
+        set_badge(treeview, full_path, fingerprint, repo_badge(status))
+        render_repo_status(text_editor, auth_label, status)
+
+    update_editor(text_editor, [(f"Git repo at: {full_path}", "bold_large"), ("", "normal"), ("Loading status...", "normal")])
+    worker.submit(read_repo_status, full_path, key="repo_status", callback=on_status,
+                  on_error=lambda e: update_editor(text_editor, [f"Failed to read git status: {e}"]))
+    return full_path
+
 def run_in_xterm(command, cwd):
     full_command = f"cd {cwd} && ({command} || echo \"Command failed\")"
     subprocess.Popen(full_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
-def run_in_xterm_zip(command, cwd, headless=True):
-    full_command = f"cd {cwd} && {command}" if headless else f"xterm -e \"cd {cwd} && {command} && echo 'Press any key to close' && read -n 1\""
-    subprocess.Popen(full_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE if headless else None)
-
 def select_new_folder(globals_dict, folder_name):
-    for item in globals_dict['treeview'].get_children():
-        if globals_dict['treeview'].item(item)["values"][0] == folder_name:
-            globals_dict['treeview'].selection_set(item)
-            globals_dict['treeview'].focus(item)
-            current_branch = on_treeview_select(globals_dict['entry'], globals_dict['treeview'], 
-                                              globals_dict['text_editor'], globals_dict['auth_label'])
-            auth_status = globals_dict['auth_label'].cget("text").split(" - ")[1]
-            globals_dict['auth_label'].config(text=f"● {current_branch if current_branch else 'No branch'} - {auth_status}", fg="#000000")
-            break
-
-def confirm_and_run_command(full_command, cwd, globals_dict, new_repo_name=None, prompt_message=""):
+    treeview = globals_dict['treeview']
+    if treeview.exists(folder_name):
+        treeview.selection_set(folder_name)
+        treeview.focus(folder_name)
+        treeview.see(folder_name)
+
+def confirm_and_run_command(full_command, cwd, globals_dict, new_repo_name=None, prompt_message="", on_success=None, steps=None, timings=None):
+    """
+    Confirms, then streams the command into the right panel; on_success runs once it exits 0.
+    With steps (see command_runner.run_steps), full_command is only what the dialog shows.
+    """
     HEADLESS = True
     formatted_command = full_command.replace('&&', '\n\n')
     
@@ -295,28 +684,32 @@ def confirm_and_run_command(full_command, cwd, globals_dict, new_repo_name=None,
     dialog = ConfirmDialog(globals_dict['root'], "RUN COMMANDS", formatted_command)
     if not dialog.result:
         return False
-        
+    if command_runner.is_running():
+        messagebox.showerror("Busy", "Another command is still running. Wait for it to finish or cancel it first.")
+        return False
+
+    def on_done(succeeded):
+        invalidate_status(cwd)
+        if cwd in repo_paths():
+            refresh_badges(globals_dict['treeview'], [cwd])
+        if not succeeded:
+            return
+        if new_repo_name:
+            update_repo_status(globals_dict['entry'], globals_dict['treeview'],
+                               on_done=lambda added, removed: select_new_folder(globals_dict, new_repo_name))
+        if on_success:
+            on_success()
+
+    if steps:
+        return command_runner.run_steps(steps, cwd, globals_dict, on_done, timings) is not None
     if HEADLESS:
-        subprocess.run(full_command, cwd=cwd, shell=True, check=True)
-    else:
-        run_in_xterm(full_command, cwd)
-    
-    if new_repo_name:
-        globals_dict['root'].after(1000, lambda: [
-            update_repo_status(globals_dict['entry'], globals_dict['treeview']),
-            select_new_folder(globals_dict, new_repo_name)
-        ])
-    globals_dict['root'].after(1000, lambda: on_treeview_select(
-        globals_dict['entry'], globals_dict['treeview'], globals_dict['text_editor'], globals_dict['auth_label']
-    ))
+        return command_runner.run_command(full_command, cwd, globals_dict, on_done) is not None
+    run_in_xterm(full_command, cwd)
+    on_done(True)
     return True
 
 def get_gh_username():
-    auth_output = run_git_command(["gh", "auth", "status"], None, "")
-    for line in auth_output.splitlines():
-        if "Logged in to github.com as" in line:
-            return line.split("as")[1].split()[0].strip()
-    return ""
+    return gh_auth.username()
 
 def require_gh_login():
     username = get_gh_username()
@@ -326,13 +719,11 @@ def require_gh_login():
     return True
 
 def show_gh_auth_status(text_editor=None):
-    auth_output = run_git_command(["gh", "auth", "status"], None, "Error checking GitHub auth status")
+    username = get_gh_username()
+    auth_status = f"✓ Logged in to {gh_auth.GH_HOST} as {username}" if username else "You Are Not Logged In𝕏❌"
     if text_editor:
-        update_editor(text_editor, ["GitHub Authentication Status:", auth_output])
-    for line in auth_output.splitlines():
-        if "Logged in to github.com" in line:
-            return line.strip()
-    return "You Are Not Logged In𝕏❌"
+        update_editor(text_editor, ["GitHub Authentication Status:", auth_status])
+    return auth_status
 
 class BranchSelectDialog(CenteredDialog):
     def __init__(self, parent, title, branches, default_branch=""):
@@ -361,92 +752,99 @@ class BranchSelectDialog(CenteredDialog):
         box.pack()
 
 def load_repo_status():
-    state_file = "repo_status.json"
-    if os.path.exists(state_file):
-        with open(state_file, 'r') as f:
-            return json.load(f)
-    return {}
-
-def update_repo_status(entry, treeview):
+    return repo_store.get()
+
+def is_repo_private(full_path):
+    return repo_store.is_private(full_path)
+
+def relabel_visibility(treeview, base_path, full_path, is_private):
+    # Main loop: record one resolved visibility and redraw its row
+    if is_private is None:
+        return  # gh failed: keep whatever we had (stale or ⏳) so the next run asks again
+    repo_store.record(full_path, is_private)
+    if _repo_tree["base"] == base_path:
+        refresh_repo_row(treeview, base_path, repo_rel(base_path, full_path))
+
+def resolve_in_background(treeview, base_path, paths, key):
+    """Asks gh about paths off the main thread; each answer relabels its row as it lands."""
+    worker.submit(resolve_visibilities, paths,
+                  lambda full_path, is_private: worker.call_soon(relabel_visibility, treeview, base_path, full_path, is_private),
+                  key=key, callback=lambda resolved: repo_store.flush(), long=True)
+
+def update_repo_status(entry, treeview, on_done=None):
+    """
+    Re-lists the repos; those with no known visibility show ⏳ until gh answers in the background.
+    """
     path = entry.get().strip()
     if not os.path.isdir(path):
         return
-    
-    repo_status = load_repo_status()
-    items = sorted([item for item in os.listdir(path) if os.path.isdir(os.path.join(path, item))])
-    
-    for item in items:
-        full_path = os.path.join(path, item)
-        if os.path.isdir(os.path.join(full_path, ".git")) and full_path not in repo_status:
-            gh_output = run_git_command(
-                ["gh", "repo", "view", "--json=isPrivate"], 
-                full_path, 
-                '{\n    "isPrivate": false\n}'
-            )
-            is_private = json.loads(gh_output).get("isPrivate", False)
-            repo_status[full_path] = is_private
-    
-    with open("repo_status.json", 'w') as f:
-        json.dump(repo_status, f, indent=4)
-    
-    update_treeview(entry, treeview)
 
-def regenerate_repo_status(entry, treeview, root):
+    def listed(added, removed):
+        missing = [full_path for full_path in repo_paths() if repo_store.lookup(full_path)[0] is None]
+        if missing:
+            resolve_in_background(treeview, path, missing, "update_repo_status")
+        if on_done:
+            on_done(added, removed)
+    update_treeview(entry, treeview, on_done=listed)
+
+# STALE-WHILE-REVALIDATE: rows render at once from the repo store, then only entries
+# missing or older than VISIBILITY_TTL are re-asked, REGEN_CONCURRENCY at a time, off the
+# main thread. Repos we know nothing about show ⏳ until their answer lands.
+def regenerate_repo_status(entry, treeview, root=None, on_done=None):
     path = entry.get().strip()
+
+    def listed(added, removed):
+        stale = visibility.stale_paths(load_repo_status(), repo_paths())
+        if stale:
+            resolve_in_background(treeview, path, stale, "regenerate_repo_status")
+        if on_done:
+            on_done(added, removed)
+    update_treeview(entry, treeview, force_badges=True, on_done=listed)  # an explicit reload re-checks every badge
+
+# WATCHER - repos changed from outside the app refresh their own row, and the right panel if selected
+def watch_base_path(globals_dict):
+    if globals_dict.get('watcher'):
+        globals_dict['watcher'].stop()
+    globals_dict['watcher'] = None
+    path = globals_dict['entry'].get().strip()
     if not os.path.isdir(path):
         return
-    
-    repo_status = {}
-    items = sorted([item for item in os.listdir(path) if os.path.isdir(os.path.join(path, item))])
-    treeview.delete(*treeview.get_children())
-    
-    def process_repo(index=0):
-        if index >= len(items):
-            with open("repo_status.json", 'w') as f:
-                json.dump(repo_status, f, indent=4)
-            return
-        
-        item = items[index]
-        full_path = os.path.join(path, item)
-        if os.path.isdir(os.path.join(full_path, ".git")):
-            gh_output = run_git_command(
-                ["gh", "repo", "view", "--json=isPrivate"], 
-                full_path, 
-                '{\n    "isPrivate": false\n}'
-            )
-            try:
-                is_private = json.loads(gh_output).get("isPrivate", False)
-                repo_status[full_path] = is_private
-            except json.JSONDecodeError:
-                repo_status[full_path] = False
-            
-            prefix = "🔒 " if repo_status[full_path] else "🌍 "
-            treeview.insert("", "end", text=f"{prefix}{item}", values=(item,))
-        
-        root.after(50, lambda: process_repo(index + 1))
-    
-    process_repo(0)
+    repo_watcher = RepoWatcher(path, repo_paths(), group_paths(),
+                               lambda changed, base_changed: worker.call_soon(handle_repo_changes, globals_dict, repo_watcher, changed, base_changed))
+    globals_dict['watcher'] = repo_watcher
+    repo_watcher.start()
+
+def handle_repo_changes(globals_dict, repo_watcher, changed, base_changed):
+    entry, treeview = globals_dict['entry'], globals_dict['treeview']
+    base_path = repo_watcher.base_path
+    if globals_dict.get('watcher') is not repo_watcher or entry.get().strip() != base_path:
+        return
+    if base_changed:
+        # A folder came or went: re-list, and badge and look up only the repos that are new
+        def rescanned(added, removed):
+            stale = visibility.stale_paths(load_repo_status(), added)
+            if stale:
+                resolve_in_background(treeview, base_path, stale, "rescan_visibility")
+            repo_watcher.update_repos(repo_paths(), group_paths())
+        update_treeview(entry, treeview, badges=False, on_done=rescanned)
+    for full_path in changed:
+        invalidate_status(full_path)
+    refresh_badges(treeview, changed)
+    if command_runner.is_running():
+        return  # leave the command's output on screen
+    if any(os.path.join(base_path, selected_repo(treeview, item)) in changed for item in treeview.selection()):
+        on_treeview_select(entry, treeview, globals_dict['text_editor'], globals_dict['auth_label'])
+
+def rename_repo_status(old_path, new_path):
+    repo_store.rename(old_path, new_path)
 
 def update_single_repo_status(full_path, is_private=None, remove=False):
-    repo_status = load_repo_status()
-    
     if remove:
-        repo_status.pop(full_path, None)
+        repo_store.forget(full_path)
     elif is_private is not None:
-        repo_status[full_path] = is_private
+        repo_store.record(full_path, is_private)
     else:
-        gh_output = run_git_command(
-            ["gh", "repo", "view", "--json=isPrivate"], 
-            full_path, 
-            '{\n    "isPrivate": false\n}'
-        )
-        try:
-            is_private = json.loads(gh_output).get("isPrivate", False)
-            repo_status[full_path] = is_private
-        except json.JSONDecodeError:
-            repo_status[full_path] = False
-    
-    with open("repo_status.json", 'w') as f:
-        json.dump(repo_status, f, indent=4)
-    
-    return repo_status
\ No newline at end of file
+        is_private = query_repo_visibility(full_path)
+        if is_private is not None:
+            repo_store.record(full_path, is_private)
+    return load_repo_status()
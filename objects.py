@@ -0,0 +1,300 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+# OBJECT READER - just enough of git's object store to read a commit without starting git:
+# loose objects, v2 pack indexes and packs (including OFS/REF deltas), and alternates.
+# Anything else (sha256 repos, missing objects, odd formats) raises ObjectError so callers
+# can fall back to the git CLI.
+OBJ_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+OFS_DELTA, REF_DELTA = 6, 7
+IDX_MAGIC = b"\377tOc"
+MAX_DELTA_DEPTH = 100
+READ_CHUNK = 16 * 1024
+IDX_CACHE_SIZE = 64  # pack indexes whose fanout tables are kept
+
+class ObjectError(Exception):
+    pass
+
+_idx_cache = OrderedDict()  # idx path -> (mtime_ns, PackIndex), least recently used first
+_idx_lock = threading.Lock()
+
+def resolve_git_dirs(full_path):
+    """
+    Returns (git_dir, common_dir). Linked worktrees keep HEAD in git_dir and refs/objects in common_dir.
+    """
+    git_dir = os.path.join(full_path, ".git")
+    if os.path.isfile(git_dir):
+        try:
+            with open(git_dir, 'r') as f:
+                target = f.read().strip().partition("gitdir:")[2].strip()
+        except OSError as e:
+            raise ObjectError(str(e))
+        git_dir = os.path.normpath(os.path.join(full_path, target))
+    common_dir = git_dir
+    try:
+        with open(os.path.join(git_dir, "commondir"), 'r') as f:
+            common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except OSError:
+        pass
+    return git_dir, common_dir
+
+def object_dirs(common_dir):
+    """The repo's objects directory followed by any alternates."""
+    dirs, pending = [], [os.path.join(common_dir, "objects")]
+    while pending:
+        path = pending.pop(0)
+        if path in dirs or not os.path.isdir(path):
+            continue
+        dirs.append(path)
+        try:
+            with open(os.path.join(path, "info", "alternates"), 'r') as f:
+                pending += [os.path.normpath(os.path.join(path, line.strip())) for line in f
+                            if line.strip() and not line.startswith("#")]
+        except OSError:
+            pass
+    return dirs
+
+class PackIndex:
+    """
+    A .idx v2 file's fanout table. Lookups open the file and binary-search the names on disk,
+    so no descriptor or mapping outlives a read (a repo's old index can go away with gc).
+    """
+    def __init__(self, path):
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(8 + 256 * 4)
+        except OSError as e:
+            raise ObjectError(str(e))
+        if len(header) < 8 + 256 * 4 or header[:4] != IDX_MAGIC or struct.unpack_from(">I", header, 4)[0] != 2:
+            raise ObjectError(f"unsupported pack index {os.path.basename(path)}")
+        self.fanout = struct.unpack_from(">256I", header, 8)
+        count = self.fanout[255]
+        self.names_at = 8 + 256 * 4
+        self.offsets_at = self.names_at + count * 24  # after the names and their CRCs
+        self.large_at = self.offsets_at + count * 4
+        self.path = path
+        self.pack_path = path[:-4] + ".pack"
+
+    def offset(self, oid):
+        lo, hi = (self.fanout[oid[0] - 1] if oid[0] else 0), self.fanout[oid[0]]
+        if lo >= hi:
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    f.seek(self.names_at + mid * 20)
+                    name = f.read(20)
+                    if name < oid:
+                        lo = mid + 1
+                    elif name > oid:
+                        hi = mid
+                    else:
+                        f.seek(self.offsets_at + mid * 4)
+                        offset = struct.unpack(">I", f.read(4))[0]
+                        if offset & 0x80000000:
+                            f.seek(self.large_at + (offset & 0x7fffffff) * 8)
+                            offset = struct.unpack(">Q", f.read(8))[0]
+                        return offset
+        except (OSError, struct.error) as e:
+            raise ObjectError(str(e))
+        return None
+
+def pack_indexes(objects_dir):
+    pack_dir = os.path.join(objects_dir, "pack")
+    try:
+        names = [name for name in os.listdir(pack_dir) if name.endswith(".idx")]
+    except OSError:
+        return []
+    indexes = []
+    for name in names:
+        path = os.path.join(pack_dir, name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        with _idx_lock:
+            cached = _idx_cache.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = _idx_cache[path] = (mtime, PackIndex(path))
+            _idx_cache.move_to_end(path)
+            while len(_idx_cache) > IDX_CACHE_SIZE:
+                _idx_cache.popitem(last=False)
+        indexes.append(cached[1])
+    return indexes
+
+def _inflate_at(f, offset):
+    f.seek(offset)
+    inflater, out = zlib.decompressobj(), []
+    while not inflater.eof:
+        chunk = f.read(READ_CHUNK)
+        if not chunk:
+            raise ObjectError("truncated pack")
+        out.append(inflater.decompress(chunk))
+    return b"".join(out)
+
+def _varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+def apply_delta(base, delta):
+    _, pos = _varint(delta, 0)
+    size, pos = _varint(delta, pos)
+    out = bytearray()
+    while pos < len(delta):
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:
+            offset = length = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (1 << (4 + i)):
+                    length |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset:offset + (length or 0x10000)]
+        elif op:
+            out += delta[pos:pos + op]
+            pos += op
+        else:
+            raise ObjectError("bad delta opcode")
+    if len(out) != size:
+        raise ObjectError("delta size mismatch")
+    return bytes(out)
+
+def _read_packed(f, offset, store, depth=0):
+    if depth > MAX_DELTA_DEPTH:
+        raise ObjectError("delta chain too deep")
+    f.seek(offset)
+    header = f.read(32)
+    byte, pos = header[0], 1
+    kind = (byte >> 4) & 7
+    while byte & 0x80:
+        byte = header[pos]
+        pos += 1
+    if kind in OBJ_TYPES:
+        return OBJ_TYPES[kind], _inflate_at(f, offset + pos)
+    if kind == OFS_DELTA:
+        byte = header[pos]
+        pos += 1
+        distance = byte & 0x7f
+        while byte & 0x80:
+            byte = header[pos]
+            pos += 1
+            distance = ((distance + 1) << 7) | (byte & 0x7f)
+        delta = _inflate_at(f, offset + pos)
+        base_type, base = _read_packed(f, offset - distance, store, depth + 1)
+    elif kind == REF_DELTA:
+        base_oid = header[pos:pos + 20]
+        delta = _inflate_at(f, offset + pos + 20)
+        base_type, base = store.read(base_oid.hex())
+    else:
+        raise ObjectError(f"unknown pack object type {kind}")
+    return base_type, apply_delta(base, delta)
+
+class ObjectStore:
+    def __init__(self, common_dir):
+        self.dirs = object_dirs(common_dir)
+        if not self.dirs:
+            raise ObjectError("no objects directory")
+
+    def read(self, oid):
+        """Returns (type, body) for a hex oid."""
+        if len(oid) != 40:
+            raise ObjectError("only sha1 object names are supported")
+        for objects_dir in self.dirs:
+            try:
+                with open(os.path.join(objects_dir, oid[:2], oid[2:]), 'rb') as f:
+                    raw = zlib.decompress(f.read())
+            except FileNotFoundError:
+                continue
+            except (OSError, zlib.error) as e:
+                raise ObjectError(str(e))
+            header, _, body = raw.partition(b"\0")
+            return header.split(b" ", 1)[0].decode(), body
+        try:
+            binary = bytes.fromhex(oid)
+        except ValueError:
+            raise ObjectError(f"bad object name {oid!r}")
+        for objects_dir in self.dirs:
+            for index in pack_indexes(objects_dir):
+                offset = index.offset(binary)
+                if offset is None:
+                    continue
+                try:
+                    with open(index.pack_path, 'rb') as f:
+                        return _read_packed(f, offset, self)
+                except (OSError, zlib.error, IndexError) as e:
+                    raise ObjectError(str(e))
+        raise ObjectError(f"object {oid[:7]} not found")
+
+def parse_commit(body):
+    headers, _, message = body.partition(b"\n\n")
+    commit = {"parents": [], "message": message.decode("utf-8", "replace")}
+    for line in headers.split(b"\n"):
+        key, _, value = line.partition(b" ")
+        if key in (b"author", b"committer"):
+            ident, _, when = value.rpartition(b">")
+            name = ident.split(b"<", 1)[0].strip().decode("utf-8", "replace")
+            parts = when.split()
+            commit[key.decode()] = (name, int(parts[0]) if parts else 0)
+        elif key == b"parent":
+            commit["parents"].append(value.decode())
+        elif key == b"tree":
+            commit["tree"] = value.decode()
+    commit["subject"] = " ".join(line.strip() for line in commit["message"].split("\n\n", 1)[0].splitlines())
+    return commit
+
+def relative_date(timestamp, now=None):
+    """Same wording and rounding as git's `--date=relative`."""
+    diff = int((time.time() if now is None else now) - timestamp)
+    if diff < 0:
+        return "in the future"
+    def plural(n, unit):
+        return f"{n} {unit}{'s' if n != 1 else ''}"
+    if diff < 90:
+        return f"{plural(diff, 'second')} ago"
+    diff = (diff + 30) // 60
+    if diff < 90:
+        return f"{plural(diff, 'minute')} ago"
+    diff = (diff + 30) // 60
+    if diff < 36:
+        return f"{plural(diff, 'hour')} ago"
+    diff = (diff + 12) // 24
+    if diff < 14:
+        return f"{plural(diff, 'day')} ago"
+    if diff < 70:
+        return f"{plural((diff + 3) // 7, 'week')} ago"
+    if diff < 365:
+        return f"{plural((diff + 15) // 30, 'month')} ago"
+    if diff < 1825:
+        total_months = (diff * 12 * 2 + 365) // (365 * 2)
+        years, months = total_months // 12, total_months % 12
+        return f"{plural(years, 'year')}, {plural(months, 'month')} ago" if months else f"{plural(years, 'year')} ago"
+    return f"{plural((diff + 183) // 365, 'year')} ago"
+
+def read_commit(full_path, oid):
+    kind, body = ObjectStore(resolve_git_dirs(full_path)[1]).read(oid)
+    if kind != "commit":
+        raise ObjectError(f"{oid[:7]} is a {kind}, not a commit")
+    return parse_commit(body)
+
+def last_commit_line(full_path, oid):
+    """
+    "abc1234 - subject (author, 2 days ago)", matching the for-each-ref line it replaces.
+    """
+    commit = read_commit(full_path, oid)
+    author, authored = commit.get("author", ("", 0))
+    return f"{oid[:7]} - {commit['subject']} ({author}, {relative_date(authored)})"
@@ -0,0 +1,191 @@
+import os
+import subprocess
+from dataclasses import dataclass
+from objects import ObjectError, ObjectStore, parse_commit, resolve_git_dirs
+
+# REFS READER - branch pickers read .git/HEAD, loose refs and packed-refs straight off disk.
+# Branches are ordered by their tip's committer date, read from the object store like
+# for-each-ref would; a tip that can't be read falls back to its newest reflog entry, then
+# the ref file's mtime. Linked worktrees, submodules and reftable repos use one
+# `git for-each-ref`.
+COMMIT_TIME_CACHE_SIZE = 4096
+_commit_times = {}  # oid -> committer time; commits never change
+
+@dataclass
+class Branch:
+    name: str          # "main", or "origin/main" for remote-tracking branches
+    oid: str
+    remote: bool = False
+    timestamp: float = 0.0
+
+@dataclass
+class RefList:
+    current: str       # checked-out branch name, "" when detached
+    head_oid: str
+    branches: list     # [Branch], newest first
+
+    @property
+    def local(self):
+        return [branch.name for branch in self.branches if not branch.remote]
+
+    def checkout_choices(self):
+        """Local branches, then remote-only ones by their short name (git checkout creates the tracking branch)."""
+        local = set(self.local)
+        choices = list(self.local)
+        for branch in self.branches:
+            short = branch.name.split("/", 1)[-1]
+            if branch.remote and short not in local:
+                local.add(short)
+                choices.append(short)
+        return choices
+
+    def all_names(self):
+        return [branch.name for branch in self.branches]
+
+def _read(path):
+    try:
+        with open(path, 'r', encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+def reflog_time(git_dir, ref):
+    """Timestamp of the newest entry in logs/<ref>: "<old> <new> Name <email> <unix-time> <tz>\\t<message>"."""
+    try:
+        with open(os.path.join(git_dir, "logs", ref), 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - 4096))
+            last = f.read().rstrip(b"\n").rsplit(b"\n", 1)[-1]
+        return float(last.split(b"\t", 1)[0].rsplit(b" ", 2)[1])
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+def parse_packed_refs(text):
+    refs = {}
+    for line in text.splitlines():
+        if not line or line[0] in "#^":
+            continue
+        oid, _, ref = line.partition(" ")
+        refs[ref.strip()] = oid
+    return refs
+
+def _loose_refs(git_dir, prefix):
+    refs = {}
+    root = os.path.join(git_dir, prefix)
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(".lock"):
+                continue
+            path = os.path.join(dirpath, filename)
+            value = (_read(path) or "").strip()
+            if value and not value.startswith("ref:"):
+                ref = prefix + "/" + os.path.relpath(path, root).replace(os.sep, "/")
+                refs[ref] = (value, path)
+    return refs
+
+def commit_time(store, oid):
+    """Committer time of commit oid; raises ObjectError when it can't be read."""
+    if oid not in _commit_times:
+        kind, body = store.read(oid)
+        if kind != "commit":
+            raise ObjectError(f"{oid[:7]} is a {kind}, not a commit")
+        if len(_commit_times) >= COMMIT_TIME_CACHE_SIZE:
+            _commit_times.clear()
+        _commit_times[oid] = float(parse_commit(body).get("committer", ("", 0))[1])
+    return _commit_times[oid]
+
+def read_refs_from_disk(git_dir):
+    """
+    Returns a RefList, or None when the layout isn't plain files (reftable, unreadable HEAD).
+    """
+    head = _read(os.path.join(git_dir, "HEAD"))
+    if head is None or os.path.isdir(os.path.join(git_dir, "reftable")):
+        return None
+    head = head.strip()
+    current_ref = head[4:].strip() if head.startswith("ref:") else ""
+    packed_path = os.path.join(git_dir, "packed-refs")
+    packed_mtime = _mtime(packed_path)
+    refs = {ref: (oid, None) for ref, oid in parse_packed_refs(_read(packed_path) or "").items()
+            if ref.startswith(("refs/heads/", "refs/remotes/"))}
+    refs.update(_loose_refs(git_dir, "refs/heads"))
+    refs.update(_loose_refs(git_dir, "refs/remotes"))
+    try:
+        store = ObjectStore(git_dir)
+    except ObjectError:
+        store = None
+    branches = []
+    for ref, (oid, path) in refs.items():
+        remote = ref.startswith("refs/remotes/")
+        name = ref[len("refs/remotes/"):] if remote else ref[len("refs/heads/"):]
+        if remote and name.endswith("/HEAD"):
+            continue
+        try:
+            if store is None:
+                raise ObjectError("no object store")
+            timestamp = commit_time(store, oid)
+        except ObjectError:
+            timestamp = reflog_time(git_dir, ref) or (_mtime(path) if path else packed_mtime)
+        branches.append(Branch(name, oid, remote, timestamp))
+    head_oid = refs.get(current_ref, ("", None))[0] if current_ref else head
+    return RefList(current_ref[len("refs/heads/"):] if current_ref.startswith("refs/heads/") else "", head_oid, branches)
+
+def read_refs_with_git(full_path):
+    result = subprocess.run(["git", "for-each-ref", "--format=%(HEAD)%00%(refname)%00%(objectname)%00%(committerdate:unix)",
+                             "refs/heads", "refs/remotes"], cwd=full_path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    if result.returncode != 0:
+        return None
+    current, head_oid, branches = "", "", []
+    for line in result.stdout.splitlines():
+        parts = line.split("\0")
+        if len(parts) != 4:
+            continue
+        is_head, ref, oid, date = parts
+        remote = ref.startswith("refs/remotes/")
+        name = ref.split("/", 2)[2]
+        if remote and name.endswith("/HEAD"):
+            continue
+        if is_head == "*":
+            current, head_oid = name, oid
+        branches.append(Branch(name, oid, remote, float(date or 0)))
+    return RefList(current, head_oid, branches)
+
+def read_refs(full_path):
+    """
+    Local and remote-tracking branches of the repo at full_path, newest commit first. No processes for plain .git dirs.
+    """
+    dot_git = os.path.join(full_path, ".git")
+    refs = read_refs_from_disk(dot_git) if os.path.isdir(dot_git) else None
+    if refs is None:
+        refs = read_refs_with_git(full_path) or RefList("", "", [])
+    refs.branches.sort(key=lambda branch: (-branch.timestamp, branch.remote, branch.name.lower()))
+    return refs
+
+def read_head(full_path):
+    """
+    Commit id HEAD points at, "" on an unborn branch: reads HEAD, its one loose ref, then packed-refs.
+    Only reftable repos or unreadable files cost a `git rev-parse`.
+    """
+    try:
+        git_dir, common_dir = resolve_git_dirs(full_path)
+    except ObjectError:
+        git_dir = common_dir = None
+    head = _read(os.path.join(git_dir, "HEAD")) if git_dir else None
+    if head is not None and not os.path.isdir(os.path.join(common_dir, "reftable")):
+        head = head.strip()
+        if not head.startswith("ref:"):
+            return head
+        ref = head[4:].strip()
+        oid = (_read(os.path.join(common_dir, ref)) or "").strip()
+        if oid and not oid.startswith("ref:"):
+            return oid
+        if not oid:
+            return parse_packed_refs(_read(os.path.join(common_dir, "packed-refs")) or "").get(ref, "")
+    result = subprocess.run(["git", "rev-parse", "--verify", "-q", "HEAD"], cwd=full_path,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return result.stdout.strip() if result.returncode == 0 else ""
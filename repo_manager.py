@@ -1,10 +1,20 @@
 import tkinter as tk
 from tkinter import simpledialog, messagebox
-from logic import run_in_xterm_zip, load_repo_status, BranchSelectDialog, update_treeview, on_treeview_select, run_in_xterm, confirm_and_run_command, get_gh_username, update_repo_status, select_new_folder, require_gh_login, run_git_command, update_single_repo_status, center_window_on_parent, centered_askstring, centered_askyesno, CenteredDialog
+from logic import selected_repo, selected_repos, rename_repo_status, BranchSelectDialog, update_treeview, on_treeview_select, run_in_xterm, confirm_and_run_command, get_gh_username, select_new_folder, require_gh_login, run_git_command, update_single_repo_status, center_window_on_parent, centered_askstring, centered_askyesno, CenteredDialog, update_editor, regenerate_repo_status, invalidate_status
 import os
-import json
-import shutil
+import shlex
 import subprocess
+import sys
+import time
+import worker
+import command_runner
+from archive import ARCHIVE_FORMATS, DEFAULT_LEVELS, archive_branch
+from bulk import bulk_action
+from staging import add_command, changed_paths, fast_status_enabled, set_fast_status, FSMONITOR_PLATFORMS
+from command_runner import describe
+from refs import read_refs
+from worktree import restore_branch_files
+from clone import CloneOptions, clone_many, mirror_dir, parse_urls
 
 def _get_valid_path(entry, treeview, require_selection=True):
     base_path = entry.get().strip()
@@ -15,7 +25,10 @@ def _get_valid_path(entry, treeview, require_selection=True):
     if require_selection and not selection:
         messagebox.showerror("Error", "Please select a folder")
         return None, None
-    selected_item = treeview.item(selection[0])["values"][0] if selection else ""
+    selected_item = selected_repo(treeview) if selection else ""
+    if require_selection and not selected_item:
+        messagebox.showerror("Error", "Please select a repository")
+        return None, None
     return base_path, os.path.join(base_path, selected_item) if selected_item else base_path
 
 def git_init(entry, treeview, globals_dict):
@@ -23,8 +36,8 @@ def git_init(entry, treeview, globals_dict):
     if folder_name is None: return
     base_path, full_path = _get_valid_path(entry, treeview, False)
     if not base_path: return
-    confirm_and_run_command(f"git init {full_path}", base_path, globals_dict)
-    update_treeview(entry, treeview)
+    confirm_and_run_command(f"git init {full_path}", base_path, globals_dict,
+                            on_success=lambda: update_treeview(entry, treeview))
 
 def gh_repo_create(entry, treeview, globals_dict):
     username = centered_askstring(globals_dict['root'], "GitHub Repo Create", "Enter your GitHub username:")
@@ -56,6 +69,8 @@ def create_new_repo(globals_dict):
 
 # 2- Save Branch
 def git_push(entry, treeview, globals_dict):
+    if len(selected_repos(treeview)) > 1:
+        return bulk_action(globals_dict, "Save Branch", selected_repos(treeview))
     if not require_gh_login(): return
     base_path, full_path = _get_valid_path(entry, treeview)
     if not base_path: return
@@ -63,27 +78,39 @@ def git_push(entry, treeview, globals_dict):
         current_branch = subprocess.check_output(["git", "rev-parse", "--abbrev-ref", "HEAD"], cwd=full_path, text=True).strip()
     except subprocess.CalledProcessError:
         current_branch = "master"
-    cmd_parts = ["git add ."]
     commit_msg = centered_askstring(globals_dict['root'], "Save Branch", "Enter commit message:", initialvalue="updated")
     if commit_msg is None: return
-    if commit_msg: cmd_parts.append(f"git commit -m \"{commit_msg}\"")
-    cmd_parts.append(f"git push -u origin {current_branch}")
-    confirm_and_run_command(" && ".join(cmd_parts), full_path, globals_dict)
+
+    def on_status(result):
+        paths, staged, seconds = result
+        if paths is None:
+            return messagebox.showerror("Error", "Could not read git status")
+        steps = []
+        if paths:
+            argv, pathspecs = add_command(paths)
+            steps.append(("add", argv, pathspecs))
+        if commit_msg and (paths or staged):
+            steps.append(("commit", ["git", "commit", "-m", commit_msg], None))
+        steps.append(("push", ["git", "push", "--progress", "-u", "origin", current_branch], None))
+        summary = "\n\n".join(f"git add -A <{len(paths)} changed paths>" if label == "add" else describe(argv) for label, argv, _ in steps)
+        confirm_and_run_command(summary, full_path, globals_dict, steps=steps, timings=[("status", seconds)])
+
+    worker.submit(changed_paths, full_path, callback=on_status,
+                  on_error=lambda e: messagebox.showerror("Error", f"Could not read git status: {e}"))
 
 # 3- Swap Branch
 def git_checkout(entry, treeview, globals_dict, root):
+    if len(selected_repos(treeview)) > 1:
+        return bulk_action(globals_dict, "Swap Branch", selected_repos(treeview))
     base_path, full_path = _get_valid_path(entry, treeview)
     if not base_path: return
-    try:
-        branches = [line.strip().replace('*', '').strip() for line in subprocess.check_output(["git", "branch"], cwd=full_path, text=True).splitlines() if line.strip()]
-        if not branches: return messagebox.showinfo("No Branches", "No existing branches found in this repository")
-        current_branch = subprocess.check_output(["git", "rev-parse", "--abbrev-ref", "HEAD"], cwd=full_path, text=True).strip()
-        branch_name = BranchSelectDialog(root, "Change Branch", branches, current_branch).result
-        if branch_name is None: return
-        if branch_name:
-            confirm_and_run_command(f"git checkout {branch_name}", full_path, globals_dict)
-    except subprocess.CalledProcessError:
-        messagebox.showerror("Error", "Could not retrieve branch list")
+    refs = read_refs(full_path)
+    branches = refs.checkout_choices()
+    if not branches: return messagebox.showinfo("No Branches", "No existing branches found in this repository")
+    branch_name = BranchSelectDialog(root, "Change Branch", branches, refs.current).result
+    if branch_name is None: return
+    if branch_name:
+        confirm_and_run_command(f"git checkout {branch_name}", full_path, globals_dict)
 
 #4- New Branch
 def git_branch(entry, treeview, globals_dict):
@@ -101,47 +128,43 @@ def git_branch_delete(entry, treeview, globals_dict, root):
     if not require_gh_login(): return
     base_path, full_path = _get_valid_path(entry, treeview)
     if not base_path: return
-    try:
-        branches = [line.strip().replace('*', '').strip() for line in subprocess.check_output(["git", "branch"], cwd=full_path, text=True).splitlines() if line.strip()]
-        if not branches: return messagebox.showinfo("No Branches", "No branches found to delete")
-        current_branch = subprocess.check_output(["git", "rev-parse", "--abbrev-ref", "HEAD"], cwd=full_path, text=True).strip()
-        branch_name = BranchSelectDialog(root, "Drop Branch", branches, "").result
-        if branch_name is None: return
-        if branch_name:
-            if branch_name == current_branch:
-                other_branches = [b for b in branches if b != branch_name]
-                if not other_branches:
-                    messagebox.showerror("Error", f"Cannot delete '{branch_name}'—it's the only branch!")
-                    return
-                confirm_and_run_command(f"git checkout {other_branches[0]} && git branch -D {branch_name} && git push origin --delete {branch_name}", full_path, globals_dict, prompt_message=f"Switching to '{other_branches[0]}' before deleting '{branch_name}'")
-            else:
-                confirm_and_run_command(f"git branch -D {branch_name} && git push origin --delete {branch_name}", full_path, globals_dict, prompt_message=f"Deleting branch '{branch_name}'")
-    except subprocess.CalledProcessError as e:
-        messagebox.showerror("Error", f"Failed to delete branch: {e.output or 'Unknown error'}")
+    refs = read_refs(full_path)
+    branches, current_branch = refs.local, refs.current
+    if not branches: return messagebox.showinfo("No Branches", "No branches found to delete")
+    branch_name = BranchSelectDialog(root, "Drop Branch", branches, "").result
+    if branch_name is None: return
+    if branch_name:
+        if branch_name == current_branch:
+            other_branches = [b for b in branches if b != branch_name]
+            if not other_branches:
+                messagebox.showerror("Error", f"Cannot delete '{branch_name}'—it's the only branch!")
+                return
+            confirm_and_run_command(f"git checkout {other_branches[0]} && git branch -D {branch_name} && git push origin --delete {branch_name}", full_path, globals_dict, prompt_message=f"Switching to '{other_branches[0]}' before deleting '{branch_name}'")
+        else:
+            confirm_and_run_command(f"git branch -D {branch_name} && git push origin --delete {branch_name}", full_path, globals_dict, prompt_message=f"Deleting branch '{branch_name}'")
 
 # 6- Fetch Branch
 def git_rollback(entry, treeview, globals_dict):
+    if len(selected_repos(treeview)) > 1:
+        return messagebox.showerror("Error", "Fetch Branch rewrites the working tree, so it runs on one repo at a time.\nUse the right-click menu for a bulk fetch.")
     base_path, full_path = _get_valid_path(entry, treeview)
     if not base_path: return
-    try:
-        branches = [line.strip().replace('*', '').strip() for line in subprocess.check_output(["git", "branch"], cwd=full_path, text=True).splitlines() if line.strip()]
-        if not branches: return messagebox.showinfo("No Branches", "No branches found to rollback to")
-        branch_name = BranchSelectDialog(globals_dict['root'], "Fetch Branch", branches, "").result
-        if branch_name is None: return
-        if branch_name:
-            if not centered_askyesno(globals_dict['root'], "Confirm Rollback", f"This will wipe all files (except .git) and replace with files from '{branch_name}'. Proceed?"):
-                return
-            for item in os.listdir(full_path):
-                item_path = os.path.join(full_path, item)
-                if item != ".git":
-                    if os.path.isfile(item_path): os.remove(item_path)
-                    elif os.path.isdir(item_path): shutil.rmtree(item_path)
-            subprocess.run(["git", "checkout", branch_name, "--", "."], cwd=full_path, check=True)
-            subprocess.run(["git", "reset"], cwd=full_path, check=True)
-            globals_dict['root'].after(100, lambda: on_treeview_select(entry, treeview, globals_dict['text_editor'], globals_dict['auth_label']))
-            messagebox.showinfo("Success", f"Rolled back files to state of branch '{branch_name}'.")
-    except subprocess.CalledProcessError as e:
-        messagebox.showerror("Error", f"Rollback failed: {e.output or 'Unknown error'}")
+    branches = read_refs(full_path).all_names()
+    if not branches: return messagebox.showinfo("No Branches", "No branches found to rollback to")
+    branch_name = BranchSelectDialog(globals_dict['root'], "Fetch Branch", branches, "").result
+    if branch_name is None: return
+    if branch_name:
+        if not centered_askyesno(globals_dict['root'], "Confirm Rollback", f"This will make all files (except .git) match branch '{branch_name}', removing untracked and ignored files. Proceed?"):
+            return
+
+        def on_restored(stats):
+            invalidate_status(full_path)
+            on_treeview_select(entry, treeview, globals_dict['text_editor'], globals_dict['auth_label'])
+            detail = f"\n\n{stats['restored']} files restored, {stats['removed'] + stats['cleaned']} removed." if stats["mode"] == "incremental" else ""
+            messagebox.showinfo("Success", f"Rolled back files to state of branch '{branch_name}'.{detail}")
+
+        worker.submit(restore_branch_files, full_path, branch_name, callback=on_restored,
+                      on_error=lambda e: messagebox.showerror("Error", f"Rollback failed: {e}"), long=True)
 
 # cm-1- Branch 2 New Repo
 def branch_to_new_repo(base_path, selected_item, full_path, globals_dict):
@@ -150,7 +173,7 @@ def branch_to_new_repo(base_path, selected_item, full_path, globals_dict):
     if not current_branch:
         messagebox.showerror("Error", "Could not determine current branch.")
         return
-    new_repo_name = centered_askstring(globals_dict['root'], "Branch 2 New Repo", f"Enter new repo name (from branch '{current_branch}'):", initialvalue=f"{selected_item}_{current_branch}")
+    new_repo_name = centered_askstring(globals_dict['root'], "Branch 2 New Repo", f"Enter new repo name (from branch '{current_branch}'):", initialvalue=f"{os.path.basename(full_path)}_{current_branch}")
     if not new_repo_name: return
     new_full_path = os.path.join(base_path, new_repo_name)
     if os.path.exists(new_full_path):
@@ -159,32 +182,96 @@ def branch_to_new_repo(base_path, selected_item, full_path, globals_dict):
     username = get_gh_username()
     project_name = new_repo_name
     visibility = "--private" if centered_askyesno(globals_dict['root'], "Create New Repo on GitHub", "Make repository private?") else "--public"
-    full_command = (
-        f"mkdir '{new_full_path}' && "
-        f"git archive {current_branch} --output='{new_full_path}/{new_repo_name}_{current_branch}.zip' && "
-        f"unzip '{new_full_path}/{new_repo_name}_{current_branch}.zip' -d '{new_full_path}' && "
-        f"rm '{new_full_path}/{new_repo_name}_{current_branch}.zip' && "
-        f"git init '{new_full_path}' && "
-        f"cd '{new_full_path}' && git add . && git commit -m 'Initial commit from branch {current_branch}' && "
-        f"gh repo create {username}/{project_name} {visibility} --source=. --remote=origin && "
-        f"git push -u origin master"
-    )
-    if confirm_and_run_command(full_command, full_path, globals_dict, new_repo_name, prompt_message=f"Creating new repo '{new_repo_name}' from branch '{current_branch}'"):
-        messagebox.showinfo("Success", f"New repo '{new_repo_name}' created from branch '{current_branch}'!")
+    keep_history = centered_askyesno(globals_dict['root'], "Branch 2 New Repo", f"Keep the history of '{current_branch}'?\n\nNo starts the new repo from a single initial commit.")
+    new_dir, branch = shlex.quote(new_full_path), shlex.quote(current_branch)
+    create_and_push = (f"gh repo create {username}/{project_name} {visibility} --source=. --remote=origin && "
+                       f"git push --progress -u origin HEAD")
+    if keep_history:
+        # Only the branch's objects are copied, once, as a pack
+        full_command = (
+            f"git clone --no-local --single-branch --branch {branch} . {new_dir} && "
+            f"cd {new_dir} && git remote remove origin && {create_and_push}"
+        )
+    else:
+        # The tar stream goes straight into the new folder: one copy of the files, no temp archive.
+        # pipefail so a failed git archive stops the chain instead of committing whatever tar got
+        extract = f"git archive --format=tar {branch} | tar -x -C {new_dir}"
+        full_command = (
+            f"mkdir {new_dir} && "
+            f"bash -o pipefail -c {shlex.quote(extract)} && "
+            f"git init {new_dir} && "
+            f"cd {new_dir} && git add . && git commit -m {shlex.quote(f'Initial commit from branch {current_branch}')} && "
+            f"{create_and_push}"
+        )
+    def on_success():
         update_single_repo_status(new_full_path, is_private=(visibility == "--private"))
+        messagebox.showinfo("Success", f"New repo '{new_repo_name}' created from branch '{current_branch}'!")
+    confirm_and_run_command(full_command, full_path, globals_dict, new_repo_name, prompt_message=f"Creating new repo '{new_repo_name}' from branch '{current_branch}'", on_success=on_success)
 
 # cm-2- Zip From Branch
+class ArchiveDialog(CenteredDialog):
+    def __init__(self, parent, title, branch):
+        self.branch = branch
+        self.result = None
+        super().__init__(parent, title)
+
+    def body(self, master):
+        tk.Label(master, text=f"Archive branch '{self.branch}' as:").pack(padx=10, pady=5)
+        self.fmt = tk.StringVar(value="zip")
+        formats = tk.Frame(master)
+        formats.pack(padx=10)
+        for fmt in ARCHIVE_FORMATS:
+            tk.Radiobutton(formats, text=fmt, variable=self.fmt, value=fmt).pack(side=tk.LEFT)
+        levels = tk.Frame(master)
+        levels.pack(padx=10, pady=5)
+        tk.Label(levels, text="Compression level (0-9):").pack(side=tk.LEFT)
+        self.level = tk.Spinbox(levels, from_=0, to=9, width=3)
+        self.level.delete(0, tk.END)
+        self.level.insert(0, str(DEFAULT_LEVELS["zip"]))
+        self.level.pack(side=tk.LEFT, padx=5)
+
+    def validate(self):
+        return self.level.get().isdigit() and 0 <= int(self.level.get()) <= 9
+
+    def apply(self):
+        self.result = (self.fmt.get(), int(self.level.get()))
+
 def zip_from_branch(base_path, selected_item, full_path, globals_dict):
     current_branch = run_git_command(["git", "rev-parse", "--abbrev-ref", "HEAD"], full_path, "main").strip()
-    zip_filename = os.path.join(base_path, f"{selected_item}_{current_branch}.zip")
-    command = f"git archive {current_branch} --output={zip_filename}"
-    run_in_xterm_zip(command, full_path)
-    messagebox.showinfo(".Zip Created", zip_filename)
+    choice = ArchiveDialog(globals_dict['root'], ".Zip Branch", current_branch).result
+    if not choice: return
+    fmt, level = choice
+    destination = os.path.join(base_path, f"{os.path.basename(full_path)}_{current_branch.replace('/', '-')}")
+    show_bar = not command_runner.is_running()  # never fight a running command for the bar
+    if show_bar:
+        command_runner.show_progress(globals_dict, f"Archiving {current_branch} as {fmt}", cancellable=False)
+
+    def owns_bar():
+        # A command started while the archive was building has taken the bar over
+        return show_bar and not command_runner.is_running()
+
+    def on_progress(percent):
+        if owns_bar():
+            worker.call_soon(command_runner.set_progress, globals_dict, percent)
+
+    def on_done(result):
+        if owns_bar():
+            command_runner.hide_progress(globals_dict)
+        note = "reused cached archive of this tree" if result["cached"] else f"built in {result['seconds']:.1f}s"
+        messagebox.showinfo(".Zip Created", f"{result['path']}\n\n{result['size'] // 1024} KB, {note}")
+
+    def on_error(e):
+        if owns_bar():
+            command_runner.hide_progress(globals_dict)
+        messagebox.showerror("Archive Failed", f"Could not archive '{current_branch}':\n{e}")
+
+    worker.submit(archive_branch, full_path, current_branch, destination, fmt, level, on_progress,
+                  callback=on_done, on_error=on_error, long=True)
 
 # cm-3-  Repo Link
 def copy_repo_link(globals_dict, selected_item):
     globals_dict['root'].clipboard_clear()
-    globals_dict['root'].clipboard_append(f"https://github.com/{get_gh_username()}/{selected_item}")
+    globals_dict['root'].clipboard_append(f"https://github.com/{get_gh_username()}/{os.path.basename(selected_item)}")
 
 # cm-4- Open Directory 
 def run_claude_code(full_path, base_path):
@@ -196,40 +283,48 @@ def open_directory(full_path):
     elif os.name == 'posix': os.system(f"open '{full_path}'")
     else: os.system(f"xdg-open '{full_path}'")
 
+# cm-5b- Fast Status
+def toggle_fast_status(globals_dict, selected_item, full_path):
+    enable = not fast_status_enabled(full_path)
+    changed = set_fast_status(full_path, enable)
+    note = "" if sys.platform in FSMONITOR_PLATFORMS else "\n\n(core.fsmonitor needs git's built-in daemon, which only ships for macOS and Windows.)"
+    messagebox.showinfo("Fast Status", f"{'Enabled' if enable else 'Disabled'} for '{selected_item}': {', '.join(changed) or 'nothing changed'}{note}")
+    invalidate_status(full_path)
+
 # cm-6- Go Public
 def go_public(globals_dict, selected_item, full_path):
     if not require_gh_login(): return
     full_command = f"gh repo edit --visibility public"
-    if confirm_and_run_command(full_command, full_path, globals_dict, prompt_message=f"Setting '{selected_item}' to public"):
+    def on_success():
         update_single_repo_status(full_path, is_private=False)
-        globals_dict['root'].after(100, lambda: update_treeview(globals_dict['entry'], globals_dict['treeview']))
+        update_treeview(globals_dict['entry'], globals_dict['treeview'])
+    confirm_and_run_command(full_command, full_path, globals_dict, prompt_message=f"Setting '{selected_item}' to public", on_success=on_success)
 
 # cm-7- Go Private
 def go_private(globals_dict, selected_item, full_path):
     if not require_gh_login(): return
     full_command = f"gh repo edit --visibility private"
-    if confirm_and_run_command(full_command, full_path, globals_dict, prompt_message=f"Setting '{selected_item}' to private"):
+    def on_success():
         update_single_repo_status(full_path, is_private=True)
-        globals_dict['root'].after(100, lambda: update_treeview(globals_dict['entry'], globals_dict['treeview']))
+        update_treeview(globals_dict['entry'], globals_dict['treeview'])
+    confirm_and_run_command(full_command, full_path, globals_dict, prompt_message=f"Setting '{selected_item}' to private", on_success=on_success)
 
 # cm-8- Rename
 def rename_repo(globals_dict, selected_item, base_path, full_path):
     if not require_gh_login(): return
-    new_name = centered_askstring(globals_dict['root'], "Rename Repository", f"Enter new name for '{selected_item}':", initialvalue=selected_item)
-    if not new_name or new_name == selected_item: return
-    new_full_path = os.path.join(base_path, new_name)
+    old_name = os.path.basename(full_path)
+    new_name = centered_askstring(globals_dict['root'], "Rename Repository", f"Enter new name for '{old_name}':", initialvalue=old_name)
+    if not new_name or new_name == old_name: return
+    new_full_path = os.path.join(os.path.dirname(full_path), new_name)
     if os.path.exists(new_full_path):
         messagebox.showerror("Error", f"A folder named '{new_name}' already exists!")
         return
-    if centered_askyesno(globals_dict['root'], "Confirm Rename", f"Rename '{selected_item}' to '{new_name}' locally and on GitHub?"):
+    if centered_askyesno(globals_dict['root'], "Confirm Rename", f"Rename '{old_name}' to '{new_name}' locally and on GitHub?"):
         try:
-            repo_status = load_repo_status()
-            current_visibility = repo_status.get(full_path, False)
             os.rename(full_path, new_full_path)
             username = get_gh_username()
-            run_in_xterm(f"gh repo rename {new_name} --repo {username}/{selected_item} --yes", new_full_path)
-            update_single_repo_status(full_path, remove=True)
-            update_single_repo_status(new_full_path, is_private=current_visibility)
+            run_in_xterm(f"gh repo rename {new_name} --repo {username}/{old_name} --yes", new_full_path)
+            rename_repo_status(full_path, new_full_path)
             globals_dict['root'].after(1000, lambda: update_treeview(globals_dict['entry'], globals_dict['treeview']))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to rename repository: {str(e)}")
@@ -252,13 +347,13 @@ def confirm_delete(globals_dict, selected_item):
     try:
         repo_path = subprocess.check_output(["git", "remote", "get-url", "origin"], cwd=full_path, text=True).strip().split('github.com/')[-1].replace('.git', '')
         full_command = f"gh repo delete {repo_path} --yes && rm -rf '{full_path}'"
-        if confirm_and_run_command(full_command, base_path, globals_dict, prompt_message=f"Deleting '{selected_item}' from GitHub and locally"):
-            messagebox.showinfo("Success", f"'{selected_item}' DELETED FOREVER")
+        def on_success():
             update_single_repo_status(full_path, remove=True)
+            update_treeview(globals_dict['entry'], globals_dict['treeview'])
+            messagebox.showinfo("Success", f"'{selected_item}' DELETED FOREVER")
+        confirm_and_run_command(full_command, base_path, globals_dict, prompt_message=f"Deleting '{selected_item}' from GitHub and locally", on_success=on_success)
     except subprocess.CalledProcessError as e:
         messagebox.showerror("Error", f"Failed to retrieve repo URL:\n{e.stderr or 'Unknown error'}")
-    finally:
-        update_treeview(globals_dict['entry'], globals_dict['treeview'])
 
 # bb-10- Clone
 class CloneDialog(CenteredDialog):
@@ -268,10 +363,21 @@ class CloneDialog(CenteredDialog):
         super().__init__(parent, title)
 
     def body(self, master):
-        tk.Label(master, text="GitHub URL:").pack(padx=10, pady=5)
-        self.url_entry = tk.Entry(master, width=40)
-        self.url_entry.pack(padx=10, pady=5)
-        return self.url_entry
+        tk.Label(master, text="GitHub URLs (one per line):").pack(padx=10, pady=5)
+        self.url_text = tk.Text(master, width=50, height=5)
+        self.url_text.pack(padx=10, pady=5)
+        options = tk.Frame(master)
+        options.pack(padx=10, pady=5, fill=tk.X)
+        self.mode = tk.StringVar(value="full")
+        for mode, label in (("full", "Full"), ("blobless", "Blobless (--filter=blob:none)"), ("shallow", "Shallow, depth:")):
+            tk.Radiobutton(options, text=label, variable=self.mode, value=mode).pack(side=tk.LEFT)
+        self.depth = tk.Spinbox(options, from_=1, to=10000, width=5)
+        self.depth.pack(side=tk.LEFT)
+        self.single_branch = tk.BooleanVar(value=False)
+        tk.Checkbutton(master, text="Single branch", variable=self.single_branch).pack(padx=10, anchor="w")
+        self.use_mirror = tk.BooleanVar(value=False)
+        tk.Checkbutton(master, text=f"Use local mirror cache ({mirror_dir()})", variable=self.use_mirror).pack(padx=10, anchor="w")
+        return self.url_text
 
     def buttonbox(self):
         box = tk.Frame(self)
@@ -279,38 +385,49 @@ class CloneDialog(CenteredDialog):
         w.pack(side=tk.LEFT, padx=5, pady=5)
         w = tk.Button(box, text="Cancel", width=10, command=self.cancel)
         w.pack(side=tk.LEFT, padx=5, pady=5)
-        self.bind("<Return>", self.ok)
         self.bind("<Escape>", self.cancel)
         box.pack()
 
+    def validate(self):
+        try:
+            int(self.depth.get())
+        except ValueError:
+            messagebox.showerror("Error", "Depth must be a number", parent=self)
+            return False
+        return True
+
     def apply(self):
-        url = self.url_entry.get().strip()
-        if url:
-            base_path = self.globals_dict['entry'].get().strip()
-            if base_path and os.path.isdir(base_path):
-                repo_name = url.split('/')[-1].replace('.git', '').strip()
-                full_path = os.path.join(base_path, repo_name)
-                try:
-                    result = subprocess.run(
-                        f"git clone {url}", 
-                        cwd=base_path, 
-                        shell=True, 
-                        text=True, 
-                        stdout=subprocess.PIPE, 
-                        stderr=subprocess.PIPE
-                    )
-                    if result.returncode == 0 and os.path.isdir(full_path):
-                        update_single_repo_status(full_path)
-                    else:
-                        messagebox.showerror("Clone Failed", f"Error cloning repository:\n{result.stderr}")
-                        return
-                except Exception as e:
-                    messagebox.showerror("Clone Error", f"Failed to execute clone command:\n{str(e)}")
-                    return
-                self.globals_dict['root'].after(100, lambda: [
-                    update_treeview(self.globals_dict['entry'], self.globals_dict['treeview']),
-                    on_treeview_select(self.globals_dict['entry'], self.globals_dict['treeview'], 
-                                     self.globals_dict['text_editor'], self.globals_dict['auth_label'])
-                ])
-            else:
-                messagebox.showerror("Error", "Invalid base directory")
\ No newline at end of file
+        urls = parse_urls(self.url_text.get(1.0, 'end'))
+        if not urls: return
+        base_path = self.globals_dict['entry'].get().strip()
+        if not base_path or not os.path.isdir(base_path):
+            messagebox.showerror("Error", "Invalid base directory")
+            return
+        options = CloneOptions(mode=self.mode.get(), depth=int(self.depth.get()),
+                               single_branch=self.single_branch.get(), use_mirror=self.use_mirror.get())
+        self.result = urls
+        clone_repos(self.globals_dict, urls, base_path, options)
+
+def clone_repos(globals_dict, urls, base_path, options):
+    """
+    Clones in the background, listing each result in the right panel as it lands.
+    """
+    text_editor = globals_dict['text_editor']
+    update_editor(text_editor, [(f"Cloning {len(urls)} repos into {base_path}", "bold_medium"), ("", "normal")])
+    started = time.monotonic()
+
+    def show_result(result):
+        mark = "✔" if result.ok else "✖"
+        text_editor.insert('end', f"{mark} {os.path.basename(result.path)}: {result.message} ({result.seconds:.1f}s)\n", "normal")
+        text_editor.see('end')
+
+    def on_done(results):
+        failed = sum(not result.ok for result in results)
+        text_editor.insert('end', f"\n{len(results) - failed} cloned, {failed} failed in {time.monotonic() - started:.1f}s\n", "bold_medium")
+        text_editor.see('end')
+        if failed < len(results):
+            # New repos show ⏳ until their visibility is resolved in the background
+            regenerate_repo_status(globals_dict['entry'], globals_dict['treeview'])
+
+    worker.submit(clone_many, urls, base_path, options, lambda result: worker.call_soon(show_result, result),
+                  callback=on_done, on_error=lambda e: messagebox.showerror("Clone Error", f"Failed to clone:\n{e}"), long=True)
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import threading
+import visibility
+
+# REPO METADATA STORE - repo_status.json is read once per process and then served from
+# memory. Changes mark the store dirty; a debounce timer coalesces them into a single
+# atomic write (temp file + rename), and on_close flushes whatever is still pending.
+FLUSH_DELAY = 2.0  # seconds
+
+_cache = None
+_dirty = False
+_timer = None
+_lock = threading.RLock()
+
+def get():
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = visibility.load_cache()
+        return _cache
+
+def lookup(full_path):
+    with _lock:
+        return visibility.lookup(get(), full_path)
+
+def is_private(full_path):
+    return bool(lookup(full_path)[0])
+
+def record(full_path, private, slug=None):
+    with _lock:
+        visibility.record(get(), full_path, private, slug)
+        _changed()
+
+def forget(full_path):
+    with _lock:
+        visibility.forget(get(), full_path)
+        _changed()
+
+def rename(old_path, new_path):
+    with _lock:
+        cache = get()
+        entry = cache["paths"].pop(old_path, None)
+        if entry is not None:
+            cache["paths"][new_path] = entry
+        _changed()
+
+def _changed():
+    global _dirty, _timer
+    _dirty = True
+    if _timer is None:
+        _timer = threading.Timer(FLUSH_DELAY, flush)
+        _timer.daemon = True
+        _timer.start()
+
+def flush(state_file=visibility.CACHE_FILE):
+    global _dirty, _timer
+    with _lock:
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+        if not _dirty:
+            return
+        data = json.dumps(_cache, indent=4)
+        _dirty = False
+    directory = os.path.dirname(os.path.abspath(state_file))
+    fd, tmp_path = tempfile.mkstemp(prefix=".repo_status.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, state_file)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        with _lock:
+            _dirty = True
@@ -0,0 +1,84 @@
+import subprocess
+import sys
+import time
+
+# CHANGE-AWARE STAGING - Save Branch stages exactly the paths `git status` reports instead of
+# `git add .` re-walking and re-hashing the whole tree. Repos can opt in to git's untracked
+# cache and (where git ships a built-in daemon) fsmonitor, which make that status call cheap.
+FSMONITOR_PLATFORMS = ("darwin", "win32")
+FAST_STATUS_KEYS = ("core.untrackedCache", "core.fsmonitor")
+
+# full_path -> core.untrackedCache on/off, so the context menu label doesn't spawn git on every
+# right-click. set_fast_status keeps it current; a change made outside the app shows after a restart.
+_fast_status = {}
+
+def _git(args, cwd):
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return 1, b""
+    return result.returncode, result.stdout
+
+def parse_changed_paths(data):
+    """
+    Returns (paths, staged) from `git status --porcelain=v2 -z` output: the paths that still need staging, and
+    whether the index already differs from HEAD. Entries whose worktree side is unchanged ("M.", "D.", "R." ...)
+    are already staged, and naming a path gone from both index and disk would fail.
+    """
+    fields, paths, staged, i = data.split(b"\0"), [], False, 0
+    while i < len(fields):
+        record = fields[i]
+        i += 1
+        if not record:
+            continue
+        kind = record[:1]
+        if kind in (b"1", b"2"):
+            if kind == b"2":
+                i += 1  # the rename's original path; its removal is already in the index
+            staged = staged or record[2:3] != b"."
+            if record[3:4] != b".":
+                paths.append(record.split(b" ", 9 if kind == b"2" else 8)[-1])
+        elif kind == b"u":
+            paths.append(record.split(b" ", 10)[-1])
+        elif kind == b"?":
+            paths.append(record[2:])
+    return paths, staged
+
+def changed_paths(full_path):
+    """
+    Returns (paths, staged, seconds); paths is None if git status failed.
+    """
+    started = time.monotonic()
+    # Untracked files one by one, not collapsed to their folder: exact names for the pathspec file
+    code, out = _git(["--no-optional-locks", "status", "--porcelain=v2", "-z", "--untracked-files=all"], full_path)
+    paths, staged = parse_changed_paths(out) if code == 0 else (None, False)
+    return paths, staged, time.monotonic() - started
+
+def add_command(paths):
+    """
+    argv and stdin for staging paths; --literal-pathspecs keeps names with * or [ from matching anything else.
+    """
+    return ["git", "--literal-pathspecs", "add", "-A", "--pathspec-from-file=-", "--pathspec-file-nul"], b"\0".join(paths)
+
+def fast_status_enabled(full_path):
+    if full_path not in _fast_status:
+        code, out = _git(["config", "--bool", "core.untrackedCache"], full_path)
+        _fast_status[full_path] = code == 0 and out.strip() == b"true"
+    return _fast_status[full_path]
+
+def set_fast_status(full_path, enabled):
+    """
+    Turns core.untrackedCache (and core.fsmonitor on FSMONITOR_PLATFORMS) on or off in the repo's own config.
+    Returns the keys that were changed.
+    """
+    keys = [key for key in FAST_STATUS_KEYS if key != "core.fsmonitor" or sys.platform in FSMONITOR_PLATFORMS]
+    changed = []
+    for key in keys:
+        args = ["config", key, "true"] if enabled else ["config", "--unset", key]
+        if _git(args, full_path)[0] == 0:
+            changed.append(key)
+    _fast_status.pop(full_path, None)
+    if "core.untrackedCache" in changed:
+        # Builds (or drops) the cache in the index right away instead of on the next status
+        _git(["update-index", "--untracked-cache" if enabled else "--no-untracked-cache"], full_path)
+    return changed
@@ -1,5 +1,6 @@
 from logic import load_state, save_state
 from color_manager import apply_color  # Import apply_color
+import repo_store
 
 
 
@@ -22,12 +23,11 @@ def set_initial_state(globals_dict):
     if url:
         from logic import update_treeview
         update_treeview(globals_dict['entry'], globals_dict['treeview'])
-    from logic import show_gh_auth_status, on_treeview_select
+    from logic import show_gh_auth_status, on_treeview_select, set_auth_status
     auth_status = show_gh_auth_status(globals_dict['text_editor'])
-    current_branch = on_treeview_select(globals_dict['entry'], globals_dict['treeview'], 
-                                      globals_dict['text_editor'], globals_dict['auth_label'])
-    globals_dict['auth_label'].config(text=f"● {current_branch if current_branch else 'No branch'} - {auth_status}", fg="#FF0000")
-    globals_dict['auth_label'].config(fg="#000000")  # Reset to black 
+    set_auth_status(globals_dict['auth_label'], auth_status, fg="#000000")
+    on_treeview_select(globals_dict['entry'], globals_dict['treeview'],
+                       globals_dict['text_editor'], globals_dict['auth_label'])
     # Use apply_color to set all colors consistently
     apply_color('font', globals_dict['font_color'], globals_dict['text_editor'], 
                 globals_dict['entry'], globals_dict['treeview'], globals_dict['style'], globals_dict)
@@ -39,6 +39,9 @@ def set_initial_state(globals_dict):
 
 def on_close(globals_dict):
     save_current_state(globals_dict)
+    if globals_dict.get('watcher'):
+        globals_dict['watcher'].stop()
+    repo_store.flush()
     globals_dict['root'].destroy()
 
 def save_current_state(globals_dict):
@@ -0,0 +1,98 @@
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from clone import CloneOptions, clone_many, clone_one, mirror_path
+
+GIT_ENV = {**os.environ, "GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@example.com",
+           "GIT_COMMITTER_NAME": "t", "GIT_COMMITTER_EMAIL": "t@example.com"}
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, env=GIT_ENV, check=True,
+                          stdout=subprocess.PIPE, text=True).stdout.strip()
+
+def make_remote(parent, name):
+    # A bare remote with three commits on main and a second branch, served over file://
+    os.makedirs(parent, exist_ok=True)
+    work, bare = os.path.join(parent, f"{name}-work"), os.path.join(parent, f"{name}.git")
+    git(parent, "init", "-q", "-b", "main", work)
+    for n in range(3):
+        with open(os.path.join(work, "file.txt"), "a") as f:
+            f.write(f"{n}\n")
+        git(work, "add", "-A")
+        git(work, "commit", "-q", "-m", f"change {n}")
+    git(work, "branch", "feature")
+    git(parent, "clone", "-q", "--bare", work, bare)
+    git(bare, "config", "uploadpack.allowFilter", "true")
+    return "file://" + bare
+
+@pytest.fixture
+def remote(tmp_path):
+    return make_remote(str(tmp_path), "lib")
+
+@pytest.fixture
+def base(tmp_path):
+    path = tmp_path / "clones"
+    path.mkdir()
+    return str(path)
+
+def test_full_clone_has_all_history(remote, base):
+    result = clone_one(remote, base)
+    assert result.ok, result.message
+    assert result.path == os.path.join(base, "lib")
+    assert git(result.path, "rev-list", "--count", "HEAD") == "3"
+    assert "origin/feature" in git(result.path, "branch", "-r")
+
+def test_shallow_clone_stops_at_depth(remote, base):
+    result = clone_one(remote, base, CloneOptions(mode="shallow", depth=1))
+    assert result.ok, result.message
+    assert git(result.path, "rev-list", "--count", "HEAD") == "1"
+    assert git(result.path, "rev-parse", "--is-shallow-repository") == "true"
+
+def test_blobless_clone_is_partial(remote, base):
+    result = clone_one(remote, base, CloneOptions(mode="blobless"))
+    assert result.ok, result.message
+    assert git(result.path, "config", "remote.origin.partialclonefilter") == "blob:none"
+    assert git(result.path, "rev-list", "--count", "HEAD") == "3"
+
+def test_single_branch_clone_skips_other_branches(remote, base):
+    result = clone_one(remote, base, CloneOptions(single_branch=True))
+    assert result.ok, result.message
+    assert "origin/feature" not in git(result.path, "branch", "-r")
+
+def test_mirror_is_created_once_and_reused(remote, tmp_path):
+    cache = str(tmp_path / "mirrors")
+    options = CloneOptions(use_mirror=True, cache_dir=cache)
+    first_base, second_base = tmp_path / "first", tmp_path / "second"
+    first_base.mkdir()
+    second_base.mkdir()
+    first = clone_one(remote, str(first_base), options)
+    second = clone_one(remote, str(second_base), options)
+    assert first.ok and second.ok, (first.message, second.message)
+    assert first.used_mirror and "mirror created" in first.message
+    assert second.used_mirror and "mirror updated" in second.message
+    assert os.listdir(cache) == [os.path.basename(mirror_path(remote, cache))]
+    # --dissociate: the clone owns its objects and keeps working without the mirror
+    assert not os.path.exists(os.path.join(second.path, ".git", "objects", "info", "alternates"))
+    shutil.rmtree(cache)
+    assert git(second.path, "rev-list", "--count", "HEAD") == "3"
+
+def test_existing_destination_is_not_overwritten(remote, base):
+    os.makedirs(os.path.join(base, "lib"))
+    result = clone_one(remote, base)
+    assert not result.ok
+    assert "already exists" in result.message
+    assert os.listdir(os.path.join(base, "lib")) == []
+
+def test_urls_with_the_same_name_clone_once(tmp_path, base):
+    first, second = make_remote(str(tmp_path / "a"), "lib"), make_remote(str(tmp_path / "b"), "lib")
+    seen = []
+    results = clone_many([first, second, first], base, on_result=seen.append)
+    assert [result.url for result in results] == [first, second]
+    assert results[0].ok, results[0].message
+    assert not results[1].ok and first in results[1].message
+    assert len(seen) == 2
+    assert os.listdir(base) == ["lib"]
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from objects import last_commit_line, relative_date
+
+COMMIT_TIME = 1_600_000_000
+# Rebased/amended commits: committed well after they were authored, so mixing the two up shows
+AUTHOR_TIME = COMMIT_TIME - 400 * 86400
+MINUTE, HOUR, DAY = 60, 3600, 86400
+# Both sides of every range boundary in git's show_date_relative, plus a few points inside the ranges
+OFFSETS = [0, 1, 89, 90, 91,
+           89 * MINUTE + 29, 89 * MINUTE + 30, 90 * MINUTE,
+           35 * HOUR + 29 * MINUTE, 35 * HOUR + 30 * MINUTE, 36 * HOUR,
+           13 * DAY + 11 * HOUR, 13 * DAY + 12 * HOUR, 14 * DAY,
+           69 * DAY, 70 * DAY, 100 * DAY, 364 * DAY, 365 * DAY, 366 * DAY,
+           500 * DAY, 547 * DAY, 548 * DAY, 729 * DAY, 730 * DAY, 1000 * DAY,
+           1824 * DAY, 1825 * DAY, 2000 * DAY, 3650 * DAY]
+
+@pytest.fixture(scope="module")
+def repo(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("relative-date"))
+    env = {**os.environ, "GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@example.com",
+           "GIT_COMMITTER_NAME": "t", "GIT_COMMITTER_EMAIL": "t@example.com",
+           "GIT_COMMITTER_DATE": f"{COMMIT_TIME} +0000", "GIT_AUTHOR_DATE": f"{AUTHOR_TIME} +0000"}
+    subprocess.run(["git", "init", "-q", path], check=True)
+    subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", "dated"], cwd=path, env=env, check=True)
+    return path
+
+@pytest.mark.parametrize("offset", OFFSETS)
+def test_relative_date_matches_git(repo, offset):
+    # GIT_TEST_DATE_NOW pins git's idea of "now", so both sides see the same difference
+    env = {**os.environ, "GIT_TEST_DATE_NOW": str(AUTHOR_TIME + offset)}
+    expected = subprocess.run(["git", "log", "-1", "--format=%ar"], cwd=repo, env=env,
+                              stdout=subprocess.PIPE, text=True, check=True).stdout.strip()
+    assert relative_date(AUTHOR_TIME, now=AUTHOR_TIME + offset) == expected
+
+def test_last_commit_line_dates_by_author(repo):
+    expected = subprocess.run(["git", "log", "-1", "--format=%h - %s (%an, %ar)"], cwd=repo,
+                              stdout=subprocess.PIPE, text=True, check=True).stdout.strip()
+    head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo,
+                          stdout=subprocess.PIPE, text=True, check=True).stdout.strip()
+    assert last_commit_line(repo, head) == expected
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from refs import read_head
+
+GIT_ENV = {**os.environ, "GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@example.com",
+           "GIT_COMMITTER_NAME": "t", "GIT_COMMITTER_EMAIL": "t@example.com"}
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, env=GIT_ENV, check=True,
+                          stdout=subprocess.PIPE, text=True).stdout.strip()
+
+@pytest.fixture
+def repo(tmp_path):
+    path = str(tmp_path / "repo")
+    git(str(tmp_path), "init", "-q", "-b", "main", path)
+    for n in range(2):
+        git(path, "commit", "-q", "--allow-empty", "-m", f"change {n}")
+    return path
+
+def test_loose_branch(repo):
+    assert read_head(repo) == git(repo, "rev-parse", "HEAD")
+
+def test_packed_branch(repo):
+    git(repo, "pack-refs", "--all")
+    assert not os.path.exists(os.path.join(repo, ".git", "refs", "heads", "main"))
+    assert read_head(repo) == git(repo, "rev-parse", "HEAD")
+
+def test_detached_head(repo):
+    git(repo, "checkout", "-q", "HEAD~1")
+    assert read_head(repo) == git(repo, "rev-parse", "HEAD")
+
+def test_unborn_branch(tmp_path):
+    path = str(tmp_path / "empty")
+    git(str(tmp_path), "init", "-q", path)
+    assert read_head(path) == ""
+
+def test_linked_worktree(repo, tmp_path):
+    other = str(tmp_path / "other")
+    git(repo, "worktree", "add", "-q", "-b", "side", other, "HEAD~1")
+    assert read_head(other) == git(repo, "rev-parse", "HEAD~1")
+    assert read_head(repo) == git(repo, "rev-parse", "HEAD")
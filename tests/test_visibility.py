@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import visibility
+
+# A stand-in for the GitHub CLI: answers `gh repo list <owner>` and `gh repo view` from
+# $FAKE_GH_REPOS ({"owner/name": is_private}), logs every call to $FAKE_GH_LOG, and fails
+# every call when $FAKE_GH_FAIL is set.
+FAKE_GH = """#!{python}
+import json, os, sys
+with open(os.environ["FAKE_GH_LOG"], "a") as log:
+    log.write(" ".join(sys.argv[1:3]) + "\\n")
+if os.environ.get("FAKE_GH_FAIL"):
+    sys.exit(1)
+repos = json.loads(os.environ["FAKE_GH_REPOS"])
+if sys.argv[1:3] == ["repo", "list"]:
+    owner = sys.argv[3].lower()
+    print(json.dumps([{{"nameWithOwner": slug, "isPrivate": private}} for slug, private in repos.items()
+                      if slug.split("/")[0] == owner]))
+elif sys.argv[1:3] == ["repo", "view"]:
+    slug = os.environ["FAKE_GH_VIEW_" + os.path.basename(os.getcwd())]
+    if slug not in repos:
+        sys.exit(1)
+    print(json.dumps({{"isPrivate": repos[slug]}}))
+else:
+    sys.exit(2)
+"""
+
+@pytest.fixture
+def fake_gh(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    gh = bin_dir / "gh"
+    gh.write_text(FAKE_GH.format(python=sys.executable))
+    gh.chmod(0o755)
+    log = tmp_path / "gh.log"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_GH_LOG", str(log))
+    monkeypatch.setenv("FAKE_GH_REPOS", json.dumps({"acme/api": True, "acme/web": False, "solo/tool": True}))
+
+    def make_repo(name, slug):
+        path = tmp_path / "repos" / name
+        (path / ".git").mkdir(parents=True)
+        (path / ".git" / "config").write_text(f'[remote "origin"]\n\turl = git@github.com:{slug}.git\n')
+        monkeypatch.setenv(f"FAKE_GH_VIEW_{name}", slug)
+        return str(path)
+
+    def calls():
+        return log.read_text().splitlines() if log.exists() else []
+
+    return make_repo, calls
+
+def test_owner_with_several_repos_is_one_list_call(fake_gh):
+    make_repo, calls = fake_gh
+    paths = [make_repo("api", "acme/api"), make_repo("web", "acme/web"), make_repo("tool", "solo/tool")]
+    results, stats = visibility.resolve_visibilities(paths)
+    assert results == {paths[0]: True, paths[1]: False, paths[2]: True}
+    assert sorted(calls()) == ["repo list", "repo view"]
+    assert stats == {"repos": 3, "gh_calls": 2, "saved": 1}
+
+def test_repo_missing_from_listing_falls_back_to_view(fake_gh, monkeypatch):
+    make_repo, calls = fake_gh
+    paths = [make_repo("api", "acme/api"), make_repo("web", "acme/web")]
+    monkeypatch.setenv("FAKE_GH_REPOS", json.dumps({"acme/api": True}))
+    results, _ = visibility.resolve_visibilities(paths)
+    assert results == {paths[0]: True, paths[1]: None}
+    assert sorted(calls()) == ["repo list", "repo view"]
+
+def test_failed_gh_reports_unknown_not_public(fake_gh, monkeypatch):
+    make_repo, calls = fake_gh
+    paths = [make_repo("api", "acme/api"), make_repo("web", "acme/web"), make_repo("tool", "solo/tool")]
+    monkeypatch.setenv("FAKE_GH_FAIL", "1")
+    seen = []
+    results, _ = visibility.resolve_visibilities(paths, on_result=lambda path, is_private: seen.append(path))
+    assert results == {path: None for path in paths}
+    assert sorted(seen) == sorted(paths)
+    # The failed listing leaves every repo to its own view call, and those fail too
+    assert sorted(calls()) == ["repo list"] + ["repo view"] * 3
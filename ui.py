@@ -6,19 +6,27 @@ from constants import *
 from logic import *
 from logic import center_window_on_parent
 from repo_manager import *
+import worker
+import change_tree
+from history import HistoryWindow
+import command_runner
+import gh_auth
 
 def show_context_menu(event, globals_dict):
     selection = globals_dict['treeview'].identify_row(event.y)
     if not selection: return
-    
+
+    selected = selected_repos(globals_dict['treeview'])
+    if selection in globals_dict['treeview'].selection() and len(selected) > 1:
+        return show_bulk_menu(event, globals_dict, selected)
     globals_dict['treeview'].selection_set(selection)
-    selected_item = globals_dict['treeview'].item(selection)["values"][0]
+    selected_item = selected_repo(globals_dict['treeview'], selection)
+    if not selected_item: return
     base_path = globals_dict['entry'].get().strip()
     full_path = os.path.join(base_path, selected_item)
     
-    from logic import load_repo_status, update_treeview
-    repo_status = load_repo_status()
-    is_private = repo_status.get(full_path, False)
+    from logic import is_repo_private, update_treeview
+    is_private = is_repo_private(full_path)
 
     cm = globals_dict['context_menu'] = tk.Menu(globals_dict['root'], tearoff=0)
     cm.add_separator()
@@ -29,8 +37,10 @@ def show_context_menu(event, globals_dict):
     cm.add_command(label=".Zip Branch", command=lambda: zip_from_branch(base_path, selected_item, full_path, globals_dict))
     cm.add_command(label="Repo Link", command=lambda: copy_repo_link(globals_dict, selected_item))
     cm.add_separator()
+    cm.add_command(label="History", command=lambda: HistoryWindow(globals_dict['root'], full_path))
     cm.add_command(label="Open Directory", command=lambda: open_directory(full_path))
     cm.add_command(label="Claude Code", command=lambda: run_claude_code(full_path, base_path))
+    cm.add_command(label=f"⚡ Fast Status: {'On' if fast_status_enabled(full_path) else 'Off'}", command=lambda: toggle_fast_status(globals_dict, selected_item, full_path))
     cm.add_separator()
     cm.add_command(label="🌍 GO PUBLIC", command=lambda: go_public(globals_dict, selected_item, full_path))
     cm.add_command(label="🔒 GO PRIVATE", command=lambda: go_private(globals_dict, selected_item, full_path))
@@ -42,6 +52,21 @@ def show_context_menu(event, globals_dict):
     cm.post(event.x_root, event.y_root)
     globals_dict['menu_visible'] = True
     
+def show_bulk_menu(event, globals_dict, selected):
+    cm = globals_dict['context_menu'] = tk.Menu(globals_dict['root'], tearoff=0)
+    cm.add_separator()
+    cm.add_command(label=f"     {len(selected)} repos selected     ", font=("Helvetica", 11, "bold"), foreground="red", command=lambda: None)
+    cm.add_separator()
+    cm.add_command(label="Save Branch", command=lambda: bulk_action(globals_dict, "Save Branch", selected))
+    cm.add_command(label="Fetch", command=lambda: bulk_action(globals_dict, "Fetch", selected))
+    cm.add_command(label="Swap Branch", command=lambda: bulk_action(globals_dict, "Swap Branch", selected))
+    cm.add_separator()
+    cm.add_command(label="🌍 GO PUBLIC", command=lambda: bulk_action(globals_dict, "Go Public", selected))
+    cm.add_command(label="🔒 GO PRIVATE", command=lambda: bulk_action(globals_dict, "Go Private", selected))
+    cm.add_separator()
+    cm.post(event.x_root, event.y_root)
+    globals_dict['menu_visible'] = True
+
 def dismiss_context_menu(event, globals_dict):
     if globals_dict.get('menu_visible', False) and not (
         treeview.winfo_rootx() <= event.x_root <= treeview.winfo_rootx() + treeview.winfo_width() and
@@ -50,6 +75,10 @@ def dismiss_context_menu(event, globals_dict):
         globals_dict['context_menu'].unpost()
         globals_dict['menu_visible'] = False
 
+def load_base_path():
+    regenerate_repo_status(globals_dict['entry'], globals_dict['treeview'],
+                           on_done=lambda added, removed: watch_base_path(globals_dict))
+
 def parse_geometry(geometry):
     width, rest = geometry.split('x')
     height, x, y = rest.split('+')
@@ -75,10 +104,11 @@ def update_auth_button():
 
 def logout_gh():
     subprocess.run("gh auth logout", shell=True, cwd=os.getcwd())
+    gh_auth.invalidate()
     auth_button.config(text="Login", command=lambda: login_gh())
-    current_branch = on_treeview_select(globals_dict['entry'], globals_dict['treeview'], 
-                                      globals_dict['text_editor'], globals_dict['auth_label'])
-    globals_dict['auth_label'].config(text=f"● {current_branch or 'No branch'} - You Are Not Logged In𝕏❌", fg="#FF0000")
+    set_auth_status(globals_dict['auth_label'], "You Are Not Logged In𝕏❌", fg="#FF0000")
+    on_treeview_select(globals_dict['entry'], globals_dict['treeview'],
+                       globals_dict['text_editor'], globals_dict['auth_label'])
 
 def login_gh():
     from logic import show_gh_auth_status, CenteredDialog 
@@ -119,12 +149,13 @@ def login_gh():
             post_login_check()
 
     def post_login_check():
+        gh_auth.invalidate()
         auth_status = show_gh_auth_status()
         if "Logged in to github.com" in auth_status:
             update_auth_button()
-            current_branch = on_treeview_select(globals_dict['entry'], globals_dict['treeview'], 
-                                              globals_dict['text_editor'], globals_dict['auth_label'])
-            globals_dict['auth_label'].config(text=f"● {current_branch or 'No branch'} - {auth_status}")
+            set_auth_status(globals_dict['auth_label'], auth_status)
+            on_treeview_select(globals_dict['entry'], globals_dict['treeview'],
+                               globals_dict['text_editor'], globals_dict['auth_label'])
         else:
             retry_dialog = LoginConfirmDialog(globals_dict['root'], "Login Check", 
                                              "Login failed or incomplete; Press Ok to check again")
@@ -151,9 +182,15 @@ clear_button.pack(side=tk.LEFT, padx=(0, 2))
 
 entry = tk.Entry(entry_frame, font=("Courier", 10))
 entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-entry.bind("<Return>", lambda e: update_treeview(entry, treeview))
+entry.bind("<Return>", lambda e: load_base_path())
 
-treeview = ttk.Treeview(left_frame, show="tree", selectmode="browse", style="Custom.Treeview")
+tk.Label(entry_frame, text="🔍", bg='white').pack(side=tk.LEFT, padx=(2, 0))
+filter_entry = tk.Entry(entry_frame, font=("Courier", 10), width=10)
+filter_entry.pack(side=tk.LEFT)
+filter_entry.bind("<KeyRelease>", lambda e: apply_filter(filter_entry, treeview))
+filter_entry.bind("<Escape>", lambda e: (filter_entry.delete(0, 'end'), apply_filter(filter_entry, treeview)))
+
+treeview = ttk.Treeview(left_frame, show="tree", selectmode="extended", style="Custom.Treeview")
 treeview.pack(fill=tk.BOTH, expand=True, padx=2, pady=(10, 0))
 
 bottom_button_frame = tk.Frame(left_frame, bg='white')
@@ -168,6 +205,7 @@ auth_button = tk.Button(left_frame, text="Checking...", command=lambda: None)
 auth_button.pack(fill=tk.X, padx=1, pady=1)
 
 treeview.bind("<<TreeviewSelect>>", lambda e: on_treeview_select(entry, treeview, text_editor, auth_label, update_auth=False))
+treeview.bind("<<TreeviewOpen>>", lambda e: expand_group(treeview, treeview.focus()))
 treeview.bind("<Button-3>", lambda e: show_context_menu(e, globals_dict))
 root.bind("<Button-3>", lambda e: dismiss_context_menu(e, globals_dict))
 root.bind("<Button-1>", lambda e: dismiss_context_menu(e, globals_dict))
@@ -194,16 +232,31 @@ tk.Button(button_frame, text="Fetch Branch", command=lambda: git_rollback(entry,
 auth_label = tk.Label(right_frame, text="Checking GitHub auth...", bg='white', wraplength=0)
 auth_label.pack(fill=tk.X, pady=(0, 2))
 
+runner_frame = tk.Frame(right_frame, bg='white')  # packed above the editor only while a command runs
+progress_bar = ttk.Progressbar(runner_frame, orient=tk.HORIZONTAL, mode="indeterminate", maximum=100)
+progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(2, 4))
+progress_label = tk.Label(runner_frame, text="", bg='white', anchor="w", width=30)
+progress_label.pack(side=tk.LEFT)
+cancel_button = tk.Button(runner_frame, text="Cancel", state=tk.DISABLED, command=lambda: command_runner.cancel_command())
+cancel_button.pack(side=tk.LEFT, padx=2)
+
 editor_frame = tk.Frame(right_frame, bg='white')
 editor_frame.pack(fill=tk.BOTH, expand=True)
 
+changes_tree = ttk.Treeview(editor_frame, columns=("info",), show="tree", selectmode="browse")
+changes_tree.column("#0", width=220, stretch=True)
+changes_tree.column("info", width=90, stretch=False, anchor="e")
+changes_tree.pack(side=tk.RIGHT, fill=tk.Y)
+change_tree.attach(changes_tree)
+
 text_editor = tk.Text(editor_frame, wrap=tk.NONE, font=("Courier", 10))
 text_editor.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
 globals_dict = GLOBAL_DEFAULTS.copy()
 globals_dict.update({'root': root, 'main_paned': main_paned, 'left_frame': left_frame, 'entry_frame': entry_frame,
-                     'entry': entry, 'treeview': treeview, 'right_frame': right_frame, 'button_frame': button_frame,
-                     'editor_frame': editor_frame, 'text_editor': text_editor, 'auth_label': auth_label, 'menu_visible': False})
+                     'entry': entry, 'filter_entry': filter_entry, 'treeview': treeview, 'right_frame': right_frame, 'button_frame': button_frame,
+                     'editor_frame': editor_frame, 'text_editor': text_editor, 'changes_tree': changes_tree, 'auth_label': auth_label, 'menu_visible': False,
+                     'runner_frame': runner_frame, 'progress_bar': progress_bar, 'progress_label': progress_label, 'cancel_button': cancel_button})
 
 style = ttk.Style()
 style.configure("Custom.Treeview", font=("Courier", 12), rowheight=25, padding=[0, 0, 0, 0])
@@ -224,8 +277,8 @@ for event, func in color_events.items():
 
 globals_dict['root'].after(100, update_auth_button)
 root.deiconify()
+worker.start(root, on_error=lambda message: messagebox.showerror("Background Error", message, parent=root))
 root.after(50, lambda: set_initial_state(globals_dict))
-from logic import regenerate_repo_status
-root.after(100, lambda: regenerate_repo_status(globals_dict['entry'], globals_dict['treeview'], globals_dict['root']))
+root.after(100, load_base_path)
 root.protocol("WM_DELETE_WINDOW", lambda: on_close(globals_dict))
 root.mainloop()
\ No newline at end of file
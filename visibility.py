@@ -0,0 +1,164 @@
+import json
+import os
+import re
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# REPO VISIBILITY (🔒/🌍) LOOKUPS AGAINST GITHUB - plain `gh` on PATH, no Tk in here
+REGEN_CONCURRENCY = 8
+GH_TIMEOUT = 30
+BULK_MIN_REPOS = 2  # owners with fewer local repos than this are cheaper to ask per repo
+LIST_LIMIT = 1000
+CACHE_FILE = "repo_status.json"
+VISIBILITY_TTL = 24 * 60 * 60  # seconds before a cached 🔒/🌍 is revalidated
+
+GITHUB_URL = re.compile(r"github\.com[:/]+([^/\s]+)/([^/\s]+?)(?:\.git)?/?$", re.IGNORECASE)
+
+last_resolve_stats = {"repos": 0, "gh_calls": 0, "saved": 0}
+
+def query_repo_visibility(full_path):
+    """
+    True/False from `gh repo view`, or None when gh couldn't answer (offline, logged out, timed out, no remote).
+    """
+    try:
+        result = subprocess.run(["gh", "repo", "view", "--json=isPrivate"], cwd=full_path,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=GH_TIMEOUT)
+        return bool(json.loads(result.stdout)["isPrivate"]) if result.returncode == 0 else None
+    except (OSError, subprocess.TimeoutExpired, json.JSONDecodeError, KeyError, TypeError, AttributeError):
+        return None
+
+def fetch_visibilities(paths, on_result=None, max_workers=REGEN_CONCURRENCY):
+    """
+    Looks up every path with at most max_workers gh processes in flight.
+    on_result(path, is_private) is called from the calling thread as each lookup finishes; is_private is None
+    for lookups that failed, which callers leave unrecorded so the next run asks again.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gh-view") as pool:
+        futures = {pool.submit(query_repo_visibility, path): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            results[path] = future.result()
+            if on_result:
+                on_result(path, results[path])
+    return results
+
+def origin_url(full_path):
+    """
+    Reads remote.origin.url straight out of the repo config, no git process.
+    """
+    config = os.path.join(full_path, ".git", "config")
+    section = None
+    try:
+        with open(config, 'r', errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    section = line.strip("[]").replace(" ", "").lower()
+                elif section == 'remote"origin"' and line.partition("=")[0].strip().lower() == "url":
+                    return line.partition("=")[2].strip()
+    except OSError:
+        pass
+    return ""
+
+def github_slug(url):
+    match = GITHUB_URL.search(url or "")
+    return f"{match.group(1)}/{match.group(2)}".lower() if match else ""
+
+def list_owner_visibility(owner, limit=LIST_LIMIT):
+    try:
+        result = subprocess.run(["gh", "repo", "list", owner, "--json", "nameWithOwner,isPrivate", "--limit", str(limit)],
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=GH_TIMEOUT)
+        if result.returncode != 0:
+            return {}
+        return {repo["nameWithOwner"].lower(): bool(repo.get("isPrivate", False)) for repo in json.loads(result.stdout)}
+    except (OSError, subprocess.TimeoutExpired, json.JSONDecodeError, KeyError, TypeError):
+        return {}
+
+def resolve_visibilities(paths, on_result=None, max_workers=REGEN_CONCURRENCY):
+    """
+    Like fetch_visibilities, but owners with several local repos are answered by one
+    `gh repo list <owner>` call matched on origin URL. Only repos left unmatched
+    (other owners, no GitHub origin, missing from the listing) fall back to `gh repo view`.
+    Returns (results, stats) where stats counts the gh calls made and saved. Failed lookups come back as None.
+    """
+    slugs = {path: github_slug(origin_url(path)) for path in paths}
+    owners = {}
+    for path, slug in slugs.items():
+        if slug:
+            owners.setdefault(slug.split("/")[0], []).append(path)
+    bulk_owners = [owner for owner, owned in owners.items() if len(owned) >= BULK_MIN_REPOS]
+
+    results, calls = {}, 0
+    def found(path, is_private):
+        results[path] = is_private
+        if on_result:
+            on_result(path, is_private)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gh-list") as pool:
+        listings = {pool.submit(list_owner_visibility, owner): owner for owner in bulk_owners}
+        for future in as_completed(listings):
+            calls += 1
+            listing = future.result()
+            for path in owners[listings[future]]:
+                if slugs[path] in listing:
+                    found(path, listing[slugs[path]])
+
+        leftovers = [path for path in paths if path not in results]
+        views = {pool.submit(query_repo_visibility, path): path for path in leftovers}
+        for future in as_completed(views):
+            calls += 1
+            found(views[future], future.result())
+
+    last_resolve_stats.update(repos=len(paths), gh_calls=calls, saved=len(paths) - calls)
+    return results, dict(last_resolve_stats)
+
+# PERSISTENT CACHE - repo_status.json keeps every answer twice: under the absolute path
+# and under the GitHub owner/name slug, so a folder renamed or moved outside the app
+# still finds its visibility through its origin URL.
+def new_cache():
+    return {"version": 2, "paths": {}, "remotes": {}}
+
+def load_cache(state_file=CACHE_FILE):
+    try:
+        with open(state_file, 'r') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return new_cache()
+    if data.get("version") == 2:
+        data.setdefault("paths", {})
+        data.setdefault("remotes", {})
+        return data
+    cache = new_cache()
+    for path, is_private in data.items():
+        # Old flat {path: bool} files: keep the values, but treat them as stale
+        if isinstance(is_private, bool):
+            cache["paths"][path] = {"private": is_private, "remote": "", "checked": 0}
+    return cache
+
+def lookup(cache, path, ttl=VISIBILITY_TTL, now=None):
+    """
+    Returns (is_private, fresh). is_private is None when nothing is known about the repo.
+    """
+    entry = cache["paths"].get(path)
+    slug = entry["remote"] if entry and entry.get("remote") else (github_slug(origin_url(path)) if not entry else "")
+    remote = cache["remotes"].get(slug) if slug else None
+    best = max((e for e in (entry, remote) if e), key=lambda e: e.get("checked", 0), default=None)
+    if best is None:
+        return None, False
+    return best["private"], (now or time.time()) - best.get("checked", 0) < ttl
+
+def record(cache, path, is_private, slug=None, now=None):
+    slug = github_slug(origin_url(path)) if slug is None else slug
+    checked = now or time.time()
+    cache["paths"][path] = {"private": is_private, "remote": slug, "checked": checked}
+    if slug:
+        cache["remotes"][slug] = {"private": is_private, "checked": checked}
+
+def forget(cache, path):
+    cache["paths"].pop(path, None)
+
+def stale_paths(cache, paths, ttl=VISIBILITY_TTL):
+    now = time.time()
+    return [path for path in paths if not lookup(cache, path, ttl, now)[1]]
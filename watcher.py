@@ -0,0 +1,209 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+
+# FILESYSTEM WATCHER - notices repos changing from terminals/editors outside the app.
+# Linux gets inotify through ctypes; everywhere else (or when inotify runs out of
+# watches) repos are polled with cheap stat calls. The base directory and the org/team
+# group folders under it are watched for folders coming and going. Either way the
+# callback gets batches of (changed_repo_paths, base_changed) from the watcher thread.
+DEBOUNCE = 0.3      # seconds of quiet before a batch of events is reported
+POLL_INTERVAL = 2.0  # seconds between stat sweeps in polling mode
+
+IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x40, 0x80, 0x100, 0x200
+IN_DELETE_SELF, IN_MOVE_SELF, IN_Q_OVERFLOW, IN_IGNORED = 0x400, 0x800, 0x4000, 0x8000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK, IN_CLOEXEC = 0o4000, 0o2000000
+
+BASE_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+GIT_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MOVED_FROM
+EVENT_HEADER = struct.Struct("iIII")
+
+# Files under .git whose changes mean the repo's status/badge may have moved
+WATCHED_GIT_PATHS = ("", "refs/heads")
+STAMP_PATHS = ("HEAD", "index", "FETCH_HEAD", "packed-refs", "refs/heads")
+
+def _load_inotify():
+    if not hasattr(os, "uname") or os.uname().sysname != "Linux":
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+def repo_stamp(repo_path):
+    stamp = []
+    for name in STAMP_PATHS:
+        try:
+            st = os.stat(os.path.join(repo_path, ".git", name))
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+def list_subdirs(path):
+    try:
+        return {entry.name for entry in os.scandir(path) if entry.is_dir()}
+    except OSError:
+        return set()
+
+class RepoWatcher(threading.Thread):
+    def __init__(self, base_path, repo_paths, on_change, group_paths=()):
+        super().__init__(name="repo-watcher", daemon=True)
+        self.base_path = base_path
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._repos = set(repo_paths)
+        self._groups = set(group_paths)
+        self._watched = {}     # repo path -> [wd, ...]
+        self._group_wds = {}   # group folder -> wd
+        self._wd_owner = {}    # wd -> repo path, or None for the base directory and group folders
+        self._polled = set()   # repos inotify couldn't take
+        self._polled_groups = set()
+        self._libc = _load_inotify()
+        self._fd = -1
+        if self._libc:
+            self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if self._fd < 0 or self._add_watch(self.base_path, None, BASE_MASK) is None:
+                self._close_fd()
+        self.mode = "inotify" if self._fd >= 0 else "polling"
+
+    def stop(self):
+        self._stop_event.set()
+
+    def update_repos(self, repo_paths, group_paths=None):
+        with self._lock:
+            self._repos = set(repo_paths)
+            if group_paths is not None:
+                self._groups = set(group_paths)
+            if self._fd >= 0:
+                self._sync_watches()
+
+    # INOTIFY
+    def _add_watch(self, path, owner, mask):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            return None
+        self._wd_owner[wd] = owner
+        return wd
+
+    def _sync_watches(self):
+        for repo in list(self._watched):
+            if repo not in self._repos:
+                for wd in self._watched.pop(repo):
+                    self._libc.inotify_rm_watch(self._fd, wd)
+                    self._wd_owner.pop(wd, None)
+        self._polled &= self._repos
+        for repo in self._repos - set(self._watched) - self._polled:
+            wds = [self._add_watch(os.path.join(repo, ".git", sub), repo, GIT_MASK) for sub in WATCHED_GIT_PATHS]
+            if wds[0] is None:
+                # Out of watches (fs.inotify.max_user_watches) or .git not a directory
+                self._polled.add(repo)
+            self._watched[repo] = [wd for wd in wds if wd is not None]
+        for group in list(self._group_wds):
+            if group not in self._groups:
+                wd = self._group_wds.pop(group)
+                self._libc.inotify_rm_watch(self._fd, wd)
+                self._wd_owner.pop(wd, None)
+        self._polled_groups &= self._groups
+        for group in self._groups - set(self._group_wds) - self._polled_groups:
+            wd = self._add_watch(group, None, BASE_MASK)
+            if wd is None:
+                self._polled_groups.add(group)
+            else:
+                self._group_wds[group] = wd
+
+    def _close_fd(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+        self._fd = -1
+
+    def _read_events(self, timeout):
+        changed, base_changed = set(), False
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changed, base_changed
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed, base_changed
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0").decode(errors="replace")
+            offset += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                base_changed = True
+                changed |= self._repos
+                continue
+            with self._lock:
+                if wd not in self._wd_owner:
+                    continue
+                owner = self._wd_owner[wd]
+                if mask & IN_IGNORED:
+                    self._wd_owner.pop(wd, None)
+            if owner is None:
+                # Only folders coming and going can change the repo list; files written into the
+                # base directory (.Zip Branch output, downloads) don't
+                base_changed = base_changed or bool(mask & (IN_ISDIR | IN_DELETE_SELF | IN_MOVE_SELF))
+            elif not name.endswith(".lock"):
+                changed.add(owner)
+        return changed, base_changed
+
+    # POLLING
+    def _listing(self):
+        # Subfolders of every folder inotify isn't watching for us
+        with self._lock:
+            folders = [self.base_path, *self._groups] if self._fd < 0 else list(self._polled_groups)
+        return {folder: list_subdirs(folder) for folder in folders}
+
+    def _poll(self, stamps, base_listing):
+        changed = set()
+        with self._lock:
+            repos = set(self._repos if self._fd < 0 else self._polled)
+        for repo in repos:
+            stamp = repo_stamp(repo)
+            if stamps.get(repo, stamp) != stamp:
+                changed.add(repo)
+            stamps[repo] = stamp
+        listing = self._listing()
+        # Folders that just joined the watch list don't count as a change
+        base_changed = any(base_listing.get(folder, subdirs) != subdirs for folder, subdirs in listing.items())
+        return changed, base_changed, listing
+
+    def run(self):
+        with self._lock:
+            if self._fd >= 0:
+                self._sync_watches()
+        stamps, base_listing = {}, self._listing()
+        self._poll(stamps, base_listing)
+        pending, pending_base, last_event, last_poll = set(), False, 0.0, time.monotonic()
+        while not self._stop_event.is_set():
+            if self._fd >= 0:
+                changed, base_changed = self._read_events(DEBOUNCE / 2)
+            else:
+                self._stop_event.wait(DEBOUNCE / 2)
+                changed, base_changed = set(), False
+            if time.monotonic() - last_poll >= POLL_INTERVAL:
+                polled, polled_base, base_listing = self._poll(stamps, base_listing)
+                changed |= polled
+                base_changed = base_changed or polled_base
+                last_poll = time.monotonic()
+            if changed or base_changed:
+                pending |= changed
+                pending_base = pending_base or base_changed
+                last_event = time.monotonic()
+            elif (pending or pending_base) and time.monotonic() - last_event >= DEBOUNCE:
+                self.on_change(pending, pending_base)
+                pending, pending_base = set(), False
+        self._close_fd()
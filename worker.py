@@ -0,0 +1,114 @@
+import itertools
+import queue
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# BACKGROUND WORK - threads do the slow stuff, Tk only ever touched from the main loop
+MAX_WORKERS = 4
+POLL_MS = 30
+
+_executor = None
+_executor_lock = threading.Lock()
+_main_calls = queue.Queue()
+_tickets = itertools.count(1)
+_latest = {}
+_error_handler = None
+
+def report(message, error):
+    """
+    Failures nobody else handles: the traceback goes to stderr, and the message to the UI's handler if start() got one.
+    """
+    print(f"{message}: {error}", file=sys.stderr)
+    traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
+    if _error_handler is not None:
+        try:
+            _error_handler(f"{message}: {error}")
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+
+def start(root, on_error=None):
+    """
+    Starts draining queued main-thread calls with root.after. Call once before mainloop.
+    on_error(message) is called on the main loop for background failures that have no on_error of their own.
+    """
+    global _error_handler
+    _error_handler = on_error
+    def drain():
+        while True:
+            try:
+                func, args = _main_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                report("Background callback failed", e)
+        root.after(POLL_MS, drain)
+    root.after(POLL_MS, drain)
+
+def call_soon(func, *args):
+    """
+    Thread-safe: runs func(*args) on the Tk main loop at the next drain.
+    """
+    _main_calls.put((func, args))
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="codecup")
+        return _executor
+
+def is_current(key, ticket):
+    return _latest.get(key, (None, None))[0] == ticket
+
+def _own_thread(run):
+    # A one-off executor, so long jobs still hand back a Future but never hold a pool slot
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="codecup-long")
+    future = executor.submit(run)
+    executor.shutdown(wait=False)
+    return future
+
+def submit(func, *args, callback=None, on_error=None, key=None, long=False):
+    """
+    Runs func(*args) on the pool and hands the result to callback on the main loop.
+    Submitting again with the same key supersedes the older task: it is cancelled
+    if it has not started yet, and its result is thrown away if it has.
+    long=True runs it on a thread of its own instead: for jobs that take minutes (bulk runs,
+    clones, archives, badge passes), which would otherwise starve the short per-repo reads.
+    """
+    ticket = next(_tickets)
+
+    def run():
+        try:
+            result, error = func(*args), None
+        except Exception as e:
+            result, error = None, e
+        call_soon(deliver, result, error)
+
+    def deliver(result, error):
+        if key is not None:
+            if not is_current(key, ticket):
+                return
+            _latest.pop(key, None)
+        if error is not None:
+            if on_error: on_error(error)
+            else: report("Background task failed", error)
+        elif callback:
+            callback(result)
+
+    if key is not None:
+        _, previous = _latest.get(key, (None, None))
+        if previous is not None:
+            previous.cancel()
+    future = _own_thread(run) if long else _get_executor().submit(run)
+    if key is not None:
+        _latest[key] = (ticket, future)
+    return future
+
+def cancel(key):
+    _, future = _latest.pop(key, (None, None))
+    if future is not None:
+        future.cancel()
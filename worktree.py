@@ -0,0 +1,85 @@
+import os
+import shutil
+import subprocess
+
+# WORKTREE RESTORE - Fetch Branch makes the working tree match another branch's files while
+# HEAD and the index stay put. Only paths that differ from the branch are rewritten or
+# removed; untracked and ignored files are cleaned the same way the old wipe removed them.
+
+def _git(args, cwd, stdin=None):
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, input=stdin, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as e:
+        return 1, b"", str(e).encode()
+    return result.returncode, result.stdout, result.stderr
+
+class RestoreError(Exception):
+    pass
+
+def _check(result, what):
+    code, out, err = result
+    if code != 0:
+        raise RestoreError(f"{what} failed: {err.decode('utf-8', 'replace').strip() or code}")
+    return out
+
+def diff_against(full_path, branch):
+    """
+    Paths where the working tree differs from branch, as (to_restore, to_remove).
+    to_remove are tracked files the branch doesn't have.
+    """
+    out = _check(_git(["diff", "--name-status", "--no-renames", "-z", branch, "--", ":/"], full_path), "git diff")
+    fields = out.split(b"\0")
+    to_restore, to_remove = [], []
+    for status, path in zip(fields[0::2], fields[1::2]):
+        (to_remove if status == b"A" else to_restore).append(path)
+    return to_restore, to_remove
+
+def _remove_empty_parents(full_path, rel_path):
+    parent = os.path.dirname(rel_path)
+    while parent:
+        try:
+            os.rmdir(os.path.join(full_path, parent))
+        except OSError:
+            return
+        parent = os.path.dirname(parent)
+
+def restore_incremental(full_path, branch):
+    """
+    Reset the index to HEAD, clean untracked/ignored files, then rewrite only the paths that differ from branch.
+    """
+    _check(_git(["rev-parse", "--verify", "--quiet", f"{branch}^{{tree}}"], full_path), f"Branch '{branch}'")
+    _check(_git(["reset", "-q"], full_path), "git reset")
+    cleaned = _check(_git(["clean", "-ffdx", "--", ":/"], full_path), "git clean").count(b"\n")
+    to_restore, to_remove = diff_against(full_path, branch)
+    for rel in to_remove:
+        rel = os.fsdecode(rel)
+        try:
+            os.remove(os.path.join(full_path, rel))
+        except FileNotFoundError:
+            pass
+        _remove_empty_parents(full_path, rel)
+    if to_restore:
+        _check(_git(["restore", f"--source={branch}", "--worktree", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                    full_path, stdin=b"\0".join(to_restore)), "git restore")
+    return {"mode": "incremental", "restored": len(to_restore), "removed": len(to_remove), "cleaned": cleaned}
+
+def restore_by_wipe(full_path, branch):
+    """
+    The original approach for gits without `git restore`: delete everything but .git and check the branch out again.
+    """
+    for item in os.listdir(full_path):
+        item_path = os.path.join(full_path, item)
+        if item != ".git":
+            if os.path.isdir(item_path) and not os.path.islink(item_path): shutil.rmtree(item_path)
+            else: os.remove(item_path)
+    _check(_git(["checkout", branch, "--", "."], full_path), "git checkout")
+    _check(_git(["reset", "-q"], full_path), "git reset")
+    return {"mode": "wipe"}
+
+def restore_branch_files(full_path, branch):
+    try:
+        return restore_incremental(full_path, branch)
+    except RestoreError as e:
+        if "restore" not in str(e) or "not a git command" not in str(e):
+            raise
+    return restore_by_wipe(full_path, branch)